@@ -0,0 +1,76 @@
+"""Cohort analytics over a synthetic attempt log.
+
+    python benchmarks/bench_analytics.py --attempts 1000000 --users 100000
+
+Builds a temporary database, times a full refresh, then appends a small
+batch and times the incremental refresh.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from restart50.analytics import CohortAnalytics  # noqa: E402
+from restart50.storage import Store  # noqa: E402
+
+COURSES = {
+    "c_ai_basics": 3, "c_data_literacy": 2, "c_digital_marketing": 2,
+    "c_iot_home": 2, "c_remotework": 2, "c_senior_entrepreneur": 1,
+}
+
+
+def synthetic_rows(n, users, rng, start=0):
+    course_ids = list(COURSES)
+    for i in range(start, start + n):
+        course_id = rng.choice(course_ids)
+        width = COURSES[course_id]
+        mask = "".join("1" if rng.random() < 0.7 else "0" for _ in range(width))
+        raw = mask.count("1")
+        yield (f"u{rng.randrange(users)}", course_id, f"2026-01-01T00:00:{i:09d}",
+               int(raw / width * 100), raw, mask)
+
+
+def insert(store, rows):
+    store._conn.execute("BEGIN")
+    store._conn.executemany(
+        "INSERT INTO attempts (user_id, course_id, ts, score, raw, correct) VALUES (?, ?, ?, ?, ?, ?)", rows
+    )
+    store._conn.execute("COMMIT")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--attempts", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--increment", type=int, default=1_000)
+    args = parser.parse_args()
+
+    rng = random.Random(50)
+    store = Store(os.path.join(tempfile.mkdtemp(prefix="restart50-analytics-"), "restart50.db"))
+    start = time.perf_counter()
+    insert(store, synthetic_rows(args.attempts, args.users, rng))
+    print(f"gerou {args.attempts:,} tentativas em {time.perf_counter() - start:.2f}s")
+
+    analytics = CohortAnalytics(store)
+    start = time.perf_counter()
+    analytics.refresh()
+    full = time.perf_counter() - start
+    print(f"refresh completo: {full:.2f}s")
+
+    insert(store, synthetic_rows(args.increment, args.users, rng, start=args.attempts))
+    start = time.perf_counter()
+    added = analytics.refresh()
+    print(f"refresh incremental (+{added:,}): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    for course_id in COURSES:
+        report = analytics.course_report(course_id)
+        print(f"  {course_id:<22} tentativas={report['attempts']:>8,} média={report['mean_score']:>5} "
+              f"aprovação={report['pass_rate']} dificuldade={analytics.question_difficulty(course_id)}")
+
+
+if __name__ == "__main__":
+    main()
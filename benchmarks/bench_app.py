@@ -0,0 +1,323 @@
+"""Headless load test: scripted sessions against the app through AppTest.
+
+    python benchmarks/bench_app.py --size 1k --sessions 20
+    python benchmarks/bench_app.py --size 100k --save-baseline
+    python benchmarks/bench_app.py --size 1m          # falha se piorar além do baseline
+
+Builds (once) a synthetic data folder with N users and N contacts, copies it
+to a fresh run folder and points the app at it with RESTART50_DATA_DIR. Each
+session logs in, enrolls, submits a quiz, opens the progress page, asks the
+chatbot and sends a contact message. Every rerun is timed; the report shows
+p50/p95/p99 per action, bytes written to the store per action and the
+process peak RSS.
+
+Results are compared with benchmarks/baselines/bench_app_<size>.json when it
+exists; the script exits with status 1 if any action regressed by more than
+--tolerance.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from restart50 import metrics  # noqa: E402
+from restart50.progress import compute_stats  # noqa: E402
+from restart50.storage import Store  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+APP = os.path.join(ROOT, "ReStart50-Web-MVP.py")
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+STATIC = ["courses.json", "intents.json", "quizzes", "images"]
+QUESTIONS = [
+    "O que é inteligência artificial?",
+    "Como funciona a avaliação?",
+    "Quero aprender sobre dados",
+    "Tem curso de marketing digital?",
+    "Como falo com o instrutor?",
+    "casa inteligente",
+]
+
+
+# ------------------- Dados sintéticos -------------------
+def synthetic_users(n, course_ids, rng):
+    for i in range(n):
+        progress = {}
+        for course_id in rng.sample(course_ids, rng.randint(0, 3)):
+            score = rng.choice([None, 33, 66, 100])
+            attempts = [] if score is None else [{"ts": f"2026-01-{1 + i % 28:02d}T10:00:00", "score": score, "raw": score // 33}]
+            progress[course_id] = {"completed": score is not None, "score": score, "attempts": attempts}
+        yield {
+            "id": f"u{i}",
+            "name": f"Aluno {i}",
+            "email": f"aluno{i}@exemplo.com",
+            "joined": "2026-01-01T00:00:00",
+            "progress": progress,
+            "stats": compute_stats(progress),
+        }
+
+
+def synthetic_contacts(n, users, course_titles, rng):
+    for i in range(n):
+        u = rng.randrange(users)
+        yield {
+            "id": f"m{i}",
+            "name": f"Aluno {u}",
+            "email": f"aluno{u}@exemplo.com",
+            "course": rng.choice(course_titles),
+            "message": "Tenho uma dúvida sobre o conteúdo da aula.",
+            "ts": f"2026-02-{1 + i % 28:02d}T{i % 24:02d}:00:00.{i:06d}",
+            "status": rng.choice(["novo", "respondido", "fechado"]),
+        }
+
+
+def chunks(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def build_dataset(folder, n):
+    """Create ``folder`` with the static files and a DB of ``n`` users/contacts."""
+    marker = os.path.join(folder, ".complete")
+    if os.path.exists(marker):
+        return
+    shutil.rmtree(folder, ignore_errors=True)
+    os.makedirs(folder)
+    for name in STATIC:
+        source = os.path.join(ROOT, "data", name)
+        if os.path.isdir(source):
+            shutil.copytree(source, os.path.join(folder, name))
+        elif os.path.exists(source):
+            shutil.copy(source, folder)
+    with open(os.path.join(ROOT, "data", "courses.json"), encoding="utf-8") as f:
+        courses = json.load(f)
+    rng = random.Random(50)
+    start = time.perf_counter()
+    store = Store(os.path.join(folder, "restart50.db"), snapshot=False)
+    for batch in chunks(synthetic_users(n, [c["id"] for c in courses], rng), 10_000):
+        store.write_batch(users=batch)
+    for batch in chunks(synthetic_contacts(n, n, ["Geral"] + [c["title"] for c in courses], rng), 10_000):
+        store.write_batch(contacts=batch)
+    store.close()
+    open(marker, "w").close()
+    print(f"gerou {n:,} usuários e {n:,} mensagens em {time.perf_counter() - start:.1f}s")
+
+
+# ------------------- Sessões -------------------
+def find(elements, label):
+    for element in elements:
+        if element.label == label:
+            return element
+    raise LookupError(f"widget {label!r} não encontrado")
+
+
+def bytes_written():
+    """Bytes committed so far, after the write-behind queue has drained."""
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        gauges = {g["name"]: g["value"] for g in metrics.REGISTRY.snapshot()["gauges"]}
+        pending = gauges.get("writebehind_enqueued", 0) - gauges.get("writebehind_written", 0) - gauges.get("writebehind_failed", 0)
+        if pending <= 0:
+            break
+        time.sleep(0.005)
+    counters = metrics.REGISTRY.snapshot()["counters"]
+    return sum(c["value"] for c in counters if c["name"] in ("storage_bytes_written", "json_bytes_written"))
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = {}
+        self.bytes = {}
+
+    def run(self, at, action):
+        before = bytes_written()
+        start = time.perf_counter()
+        at.run()
+        elapsed = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(f"{action}: {at.exception[0].message}")
+        self.samples.setdefault(action, []).append(elapsed)
+        self.bytes.setdefault(action, []).append(bytes_written() - before)
+        return at
+
+
+def session(rec, rng, users, timeout):
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    rec.run(at, "load")
+
+    # Metade das sessões entra com uma conta existente, a outra cria conta
+    n = rng.randrange(users) if rng.random() < 0.5 else f"novo-{uuid.uuid4().hex[:8]}"
+    find(at.text_input, "Nome").input(f"Aluno {n}")
+    find(at.text_input, "E-mail").input(f"aluno{n}@exemplo.com")
+    find(at.button, "Entrar / Criar conta").click()
+    rec.run(at, "login")
+
+    find(at.sidebar.radio, "📚 Menu").set_value("Cursos")
+    rec.run(at, "open_courses")
+    start_buttons = [b for b in at.button if (b.key or "").startswith("start_")]
+    rng.choice(start_buttons).click()
+    rec.run(at, "enroll")
+
+    find(at.sidebar.radio, "📚 Menu").set_value("Avaliações")
+    rec.run(at, "open_quiz")
+    for radio in at.radio:
+        if (radio.key or "").startswith("q_"):
+            radio.set_value(rng.randrange(len(radio.options)))
+    find(at.button, "Enviar respostas").click()
+    rec.run(at, "quiz_submit")
+
+    find(at.sidebar.radio, "📚 Menu").set_value("Meu Progresso")
+    rec.run(at, "progress")
+
+    find(at.sidebar.radio, "📚 Menu").set_value("Chatbot")
+    rec.run(at, "open_chatbot")
+    for _ in range(3):
+        find(at.text_input, "Digite sua dúvida aqui").input(rng.choice(QUESTIONS))
+        find(at.button, "Enviar pergunta").click()
+        rec.run(at, "chatbot")
+
+    find(at.sidebar.radio, "📚 Menu").set_value("Contato com Instrutor")
+    rec.run(at, "open_contact")
+    find(at.text_area, "Sua dúvida / mensagem").input("Não consegui terminar o módulo 2, podem ajudar?")
+    find(at.button, "Enviar mensagem").click()
+    rec.run(at, "contact_submit")
+
+
+# ------------------- Relatório -------------------
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def summarize(rec):
+    report = {}
+    for action, values in rec.samples.items():
+        written = rec.bytes[action]
+        report[action] = {
+            "n": len(values),
+            "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+            "bytes_per_action": round(sum(written) / len(written)),
+        }
+    return report
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KiB, macOS em bytes
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def regressions(result, baseline, tolerance, slack_ms):
+    found = []
+    for action, now in result["actions"].items():
+        before = baseline["actions"].get(action)
+        if not before:
+            continue
+        for field in ("p50_ms", "p95_ms"):
+            if now[field] > before[field] * (1 + tolerance) + slack_ms:
+                found.append(f"{action}.{field}: {before[field]} -> {now[field]}")
+        if now["bytes_per_action"] > before["bytes_per_action"] * (1 + tolerance) + 64:
+            found.append(f"{action}.bytes_per_action: {before['bytes_per_action']} -> {now['bytes_per_action']}")
+    if result["peak_rss_mb"] and baseline.get("peak_rss_mb"):
+        if result["peak_rss_mb"] > baseline["peak_rss_mb"] * (1 + tolerance):
+            found.append(f"peak_rss_mb: {baseline['peak_rss_mb']} -> {result['peak_rss_mb']}")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", choices=SIZES, default="1k")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "restart50-bench"))
+    parser.add_argument("--timeout", type=float, default=600, help="limite por rerun, em segundos")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="piora relativa aceita (0.25 = 25%%)")
+    parser.add_argument("--slack-ms", type=float, default=5.0, help="folga absoluta para tempos muito curtos")
+    parser.add_argument("--baseline", help="arquivo de baseline (padrão: baselines/bench_app_<size>.json)")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--json", help="grava o resultado completo neste arquivo")
+    args = parser.parse_args()
+
+    users = SIZES[args.size]
+    template = os.path.join(args.workdir, f"dataset-{args.size}")
+    build_dataset(template, users)
+    run_dir = os.path.join(args.workdir, f"run-{args.size}")
+    shutil.rmtree(run_dir, ignore_errors=True)
+    shutil.copytree(template, run_dir)
+    os.environ["RESTART50_DATA_DIR"] = run_dir
+    os.environ.setdefault("RESTART50_IMAGE_SEED_DIR", os.path.join(run_dir, "images"))
+
+    rng = random.Random(2025)
+    # Sessão de aquecimento: abre o banco e carrega catálogo/índices (fora das estatísticas)
+    start = time.perf_counter()
+    session(Recorder(), rng, users, args.timeout)
+    print(f"aquecimento: {time.perf_counter() - start:.1f}s")
+
+    rec = Recorder()
+    start = time.perf_counter()
+    for _ in range(args.sessions):
+        session(rec, rng, users, args.timeout)
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "size": args.size,
+        "sessions": args.sessions,
+        "sessions_per_s": round(args.sessions / elapsed, 2),
+        "peak_rss_mb": peak_rss_mb(),
+        "actions": summarize(rec),
+    }
+    print(f"\n{args.sessions} sessões em {elapsed:.1f}s ({result['sessions_per_s']} sessões/s), "
+          f"pico de memória {result['peak_rss_mb']} MB, base {users:,} usuários/mensagens")
+    print(f"{'ação':<16}{'n':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'bytes':>10}")
+    for action, row in result["actions"].items():
+        print(f"{action:<16}{row['n']:>5}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}{row['bytes_per_action']:>10}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    baseline_path = args.baseline or os.path.join(BASELINES, f"bench_app_{args.size}.json")
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nbaseline gravado em {baseline_path}")
+        return 0
+    if not os.path.exists(baseline_path):
+        print(f"\nsem baseline em {baseline_path}; use --save-baseline para criar")
+        return 0
+    with open(baseline_path, encoding="utf-8") as f:
+        found = regressions(result, json.load(f), args.tolerance, args.slack_ms)
+    if found:
+        print("\nREGRESSÃO em relação ao baseline:")
+        for line in found:
+            print(f"  {line}")
+        return 1
+    print("\nsem regressões em relação ao baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Stress test: N concurrent simulated sessions submitting quiz attempts.
+
+Each worker process opens its own Store (like a separate Streamlit server)
+and runs several threads (like browser sessions). All of them record
+attempts for the same small set of users, then the script checks that
+every attempt made it to disk: the full history in the ``attempts`` table,
+and each profile's inline attempts (capped at ``attempts_inline``) plus its
+rollup count matching that history.
+
+    python benchmarks/bench_concurrent_writes.py --procs 4 --threads 4 --attempts 50
+    python benchmarks/bench_concurrent_writes.py --naive   # old snapshot + put_user path
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import Process
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from restart50.storage import Store  # noqa: E402
+
+COURSE = "c_ai_basics"
+
+
+def session(store, user_ids, attempts, tag, naive):
+    for i in range(attempts):
+        uid = user_ids[i % len(user_ids)]
+        attempt = {"ts": f"{tag}-{i}", "score": 100, "raw": 3}
+        if naive:
+            # Comportamento antigo: snapshot local + regravação do usuário inteiro
+            user = store.get_user(uid)
+            user["progress"].setdefault(COURSE, {"completed": False, "score": None, "attempts": []})
+            user["progress"][COURSE]["attempts"].append(attempt)
+            time.sleep(0)
+            store.put_user(user)
+        else:
+            store.record_attempt(uid, COURSE, attempt)
+
+
+def worker(db_path, user_ids, threads, attempts, proc_no, naive):
+    store = Store(db_path)
+    pool = [
+        threading.Thread(target=session, args=(store, user_ids, attempts, f"p{proc_no}t{t}", naive))
+        for t in range(threads)
+    ]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--procs", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--attempts", type=int, default=50, help="attempts per session")
+    parser.add_argument("--users", type=int, default=3)
+    parser.add_argument("--naive", action="store_true")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="restart50-bench-")
+    db_path = os.path.join(tmp, "restart50.db")
+    store = Store(db_path)
+    user_ids = [f"u{i}" for i in range(args.users)]
+    for uid in user_ids:
+        store.put_user({"id": uid, "name": uid, "email": f"{uid}@exemplo.com", "progress": {}})
+
+    start = time.perf_counter()
+    procs = [
+        Process(target=worker, args=(db_path, user_ids, args.threads, args.attempts, p, args.naive))
+        for p in range(args.procs)
+    ]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    elapsed = time.perf_counter() - start
+
+    expected = args.procs * args.threads * args.attempts
+    users = store.load_users()
+    entries = {uid: u.get("progress", {}).get(COURSE, {}) for uid, u in users.items()}
+    if args.naive:
+        # O caminho antigo não arquiva: tudo fica no perfil
+        stored = sum(len(e.get("attempts", [])) for e in entries.values())
+        bad_profiles = 0
+    else:
+        archived = dict(store.query("SELECT user_id, COUNT(*) FROM attempts WHERE course_id = ? GROUP BY user_id", (COURSE,)))
+        stored = sum(archived.values())
+        # Perfil: no máximo attempts_inline tentativas inline, o resto resumido no rollup
+        bad_profiles = sum(
+            1 for uid, e in entries.items()
+            if len(e.get("attempts", [])) != min(store.attempts_inline, archived.get(uid, 0))
+            or len(e.get("attempts", [])) + e.get("rollup", {}).get("count", 0) != archived.get(uid, 0)
+        )
+    sessions = args.procs * args.threads
+    print(f"sessions={sessions} expected={expected} stored={stored} lost={expected - stored} "
+          f"bad_profiles={bad_profiles} elapsed={elapsed:.2f}s ({expected / elapsed:.0f} writes/s)")
+    return 0 if stored == expected and not bad_profiles else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""Bulk quiz grading against the precompiled answer keys.
+
+    python benchmarks/bench_grading.py --submissions 1000000
+    python benchmarks/bench_grading.py --course c_ai_basics --budget 1.0
+
+Generates synthetic answer sheets for a course of data/quizzes (learners of
+varying ability, so the per-question statistics mean something), then times
+``grade_batch`` plus the difficulty/discrimination sums over the whole batch,
+and the single-submission path used by the quiz form. Exits with status 1 if
+the batch takes longer than --budget seconds. Uses numpy when installed; the
+sheet generation is not part of the measurement.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from restart50 import grading  # noqa: E402
+from restart50.catalog import Catalog  # noqa: E402
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+
+def synthetic_sheets(quiz, n, seed):
+    """``n`` rows of answers; each learner gets a question right with probability = ability."""
+    answers = [q["answer"] for q in quiz]
+    choices = [len(q["choices"]) for q in quiz]
+    if grading.np is not None:
+        np = grading.np
+        rng = np.random.default_rng(seed)
+        ability = rng.uniform(0.3, 0.95, size=(n, 1))
+        right = rng.random((n, len(quiz))) < ability
+        guess = (rng.integers(0, 1 << 16, size=(n, len(quiz))) % np.asarray(choices)).astype(np.int16)
+        return np.where(right, np.asarray(answers, dtype=np.int16), guess)
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        ability = rng.uniform(0.3, 0.95)
+        rows.append(tuple(a if rng.random() < ability else rng.randrange(c) for a, c in zip(answers, choices)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--submissions", type=int, default=1_000_000)
+    parser.add_argument("--course", default="c_ai_basics")
+    parser.add_argument("--data", default=DATA)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=1.0, help="tempo máximo do lote, em segundos")
+    args = parser.parse_args()
+
+    catalog = Catalog(os.path.join(args.data, "courses.json"), os.path.join(args.data, "quizzes"))
+    grader = grading.Grader(catalog)
+    key = grader.key(args.course)
+    print(f"curso {args.course}: {key.size} questões, numpy {'sim' if grading.np is not None else 'não'}")
+
+    start = time.perf_counter()
+    sheets = synthetic_sheets(key.quiz, args.submissions, seed=50)
+    print(f"gerou {args.submissions:,} folhas em {time.perf_counter() - start:.2f}s")
+
+    best = None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        result = grader.grade_batch(args.course, sheets)
+        graded = time.perf_counter() - start
+        stats = grading.ItemStats(key.size)
+        stats.add_batch(result)
+        total = time.perf_counter() - start
+        if best is None or total < best[1]:
+            best = (graded, total)
+    graded, total = best
+    print(f"grade_batch: {graded:.3f}s  (+ estatísticas: {total:.3f}s)  "
+          f"{args.submissions / total:,.0f} folhas/s")
+    for k, (p, r) in enumerate(zip(stats.difficulty(), stats.discrimination()), start=1):
+        print(f"  questão {k}: acertos={p:.3f} discriminação={r:.3f}")
+
+    n = 10_000
+    rows = [list(row) for row in sheets[:n]]
+    start = time.perf_counter()
+    for row in rows:
+        grader.attempt(args.course, row)
+    print(f"attempt (formulário): {(time.perf_counter() - start) / n * 1e6:.1f} µs por submissão")
+
+    if total > args.budget:
+        print(f"\nACIMA DO ORÇAMENTO: {total:.3f}s > {args.budget:.3f}s")
+        return 1
+    print(f"\ndentro do orçamento de {args.budget:.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Bytes transferred per Cursos page view: remote originals vs cached thumbnails.
+
+    python benchmarks/bench_images.py                      # downloads the covers once
+    python benchmarks/bench_images.py --seed-dir covers/   # offline, files named <url_key>.<ext>
+
+The cache is built in a temporary directory, so the app's data/images is
+left untouched.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+
+from restart50.catalog import Catalog  # noqa: E402
+from restart50.images import Image, ImageCache  # noqa: E402
+
+
+def course_images():
+    catalog = Catalog(os.path.join(ROOT, "data", "courses.json"), os.path.join(ROOT, "data", "quizzes"))
+    return [c["image"] for c in catalog.courses]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed-dir")
+    parser.add_argument("--width", type=int, default=480)
+    args = parser.parse_args()
+
+    if Image is None:
+        print("aviso: Pillow não instalado; as imagens serão cacheadas sem redimensionar")
+
+    cache = ImageCache(tempfile.mkdtemp(prefix="restart50-img-"), seed_dir=args.seed_dir, width=args.width)
+    urls = course_images()
+    before = after = 0
+    start = time.perf_counter()
+    for url in urls:
+        path = cache.thumbnail(url, wait=True)
+        if path is None:
+            print(f"  falhou: {url[:70]}")
+            continue
+        entry = cache.manifest[url]
+        before += entry["source_bytes"]
+        after += entry["bytes"]
+        print(f"  {entry['source_bytes']:>10,} -> {entry['bytes']:>8,} bytes  {url[:60]}")
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for url in urls:
+        cache.thumbnail(url)
+    warm = time.perf_counter() - start
+
+    print(f"\npor visualização da página Cursos: antes {before:,} bytes, depois {after:,} bytes"
+          + (f" ({100 * (1 - after / before):.0f}% menos)" if before else ""))
+    print(f"primeira carga {cold:.2f}s, cargas seguintes {warm * 1000:.2f} ms (sem rede)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Micro-benchmark: intent classification throughput, old chain vs IntentEngine.
+
+    python benchmarks/bench_intents.py --messages 10000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from restart50.intents import IntentEngine  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+SAMPLES = [
+    "O que é IA?",
+    "Como vejo minhas notas?",
+    "Quero falar com o instrutor sobre a questão 4",
+    "Bom dia, qual a importância dos dados no dia a dia?",
+    "Tenho dispositivos de internet das coisas em casa",
+    "Vocês têm algum curso de marketing para redes sociais?",
+    "Onde fica o quiz do curso de empreendedorismo?",
+    "Preciso de ajuda para trabalhar de casa com reuniões online",
+]
+
+
+def legacy_chain(txt):
+    # Cadeia if/elif original da página Chatbot
+    txt = txt.lower()
+    if any(k in txt for k in ["ia", "inteligência", "inteligencia"]):
+        return "ia"
+    elif any(k in txt for k in ["iot", "internet das coisas", "coisas"]):
+        return "iot"
+    elif any(k in txt for k in ["quiz", "avaliação", "nota"]):
+        return "avaliacoes"
+    elif any(k in txt for k in ["contato", "instrutor", "duvida"]):
+        return "contato"
+    return None
+
+
+def run(label, fn, messages):
+    start = time.perf_counter()
+    results = [fn(m) for m in messages]
+    elapsed = time.perf_counter() - start
+    print(f"{label:<14} {len(messages) / elapsed:>12,.0f} msgs/s  ({elapsed * 1000:.1f} ms)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=10000)
+    args = parser.parse_args()
+
+    rng = random.Random(50)
+    messages = [rng.choice(SAMPLES) for _ in range(args.messages)]
+    engine = IntentEngine.from_file(os.path.join(ROOT, "data", "intents.json"))
+
+    old = run("if/elif chain", legacy_chain, messages)
+    start = time.perf_counter()
+    new = run("IntentEngine", lambda m: (engine.classify(m) or {}).get("name"), messages)
+    rate = len(messages) / (time.perf_counter() - start)
+    print(f"meta 10.000 msgs/s: {'ok' if rate >= 10000 else 'ABAIXO'}")
+
+    print("\nclassificação por amostra (antigo -> novo):")
+    for sample in SAMPLES:
+        i = messages.index(sample) if sample in messages else None
+        if i is not None:
+            print(f"  {old[i]!s:<11} -> {new[i]!s:<11} {sample}")
+
+
+if __name__ == "__main__":
+    main()
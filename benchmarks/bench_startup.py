@@ -0,0 +1,159 @@
+"""Startup cost: module import time and first render of each page.
+
+    python benchmarks/bench_startup.py --repeat 5
+    python benchmarks/bench_startup.py --save-baseline
+    python benchmarks/bench_startup.py --imports-only      # sem Streamlit AppTest
+
+Every measurement runs in a fresh interpreter so nothing is already cached.
+Import times cover what the main script loads on every run and each page
+module on its own. The render part opens the app with AppTest and then visits
+one page, reporting the cold first run and the first visit to that page;
+each render gets a fresh copy of the static data files (RESTART50_DATA_DIR),
+so the benchmark never writes to data/.
+
+Results are compared with benchmarks/baselines/bench_startup.json when it
+exists; the script exits with status 1 if a median got worse by more than
+--tolerance.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+APP = os.path.join(ROOT, "ReStart50-Web-MVP.py")
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "bench_startup.json")
+STATIC = ["courses.json", "intents.json", "quizzes", "images"]
+
+# O que o script principal importa em toda execução
+MAIN_IMPORTS = ["restart50.metrics", "restart50.resources", "restart50.progress", "restart50.speech", "restart50.theme"]
+PAGES = {
+    "Início": "home",
+    "Cursos": "courses",
+    "Avaliações": "quizzes",
+    "Meu Progresso": "my_progress",
+    "Contato com Instrutor": "contact",
+    "Chatbot": "chat",
+}
+
+IMPORT_CHILD = """
+import sys, time
+sys.path.insert(0, {root!r})
+import streamlit  # custo do próprio Streamlit fica fora da medição
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+print(time.perf_counter() - start)
+"""
+
+RENDER_CHILD = """
+import sys, time
+sys.path.insert(0, {root!r})
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=120)
+start = time.perf_counter()
+at.run()
+first = time.perf_counter() - start
+at.sidebar.radio[0].set_value({page!r})
+start = time.perf_counter()
+at.run()
+visit = time.perf_counter() - start
+if at.exception:
+    raise SystemExit(at.exception[0].message)
+print(first, visit)
+"""
+
+
+def child(code, env=None):
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True,
+                         env=dict(os.environ, **(env or {})))
+    return [float(v) for v in out.stdout.split()]
+
+
+def render(page):
+    # Cópia descartável dos dados: o app cria banco e arquivos sem tocar em data/
+    folder = tempfile.mkdtemp(prefix="restart50-startup-")
+    try:
+        for name in STATIC:
+            source = os.path.join(ROOT, "data", name)
+            if os.path.isdir(source):
+                shutil.copytree(source, os.path.join(folder, name))
+            elif os.path.exists(source):
+                shutil.copy(source, folder)
+        return child(RENDER_CHILD.format(root=ROOT, app=APP, page=page), env={"RESTART50_DATA_DIR": folder})
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def median_ms(samples):
+    return round(statistics.median(samples) * 1000, 2)
+
+
+def measure(repeat, imports_only):
+    result = {"imports": {}, "render": {}}
+    groups = {"main": MAIN_IMPORTS}
+    groups.update({f"view:{mod}": MAIN_IMPORTS + [f"restart50.views.{mod}"] for mod in PAGES.values()})
+    for name, modules in groups.items():
+        samples = [child(IMPORT_CHILD.format(root=ROOT, modules=modules))[0] for _ in range(repeat)]
+        result["imports"][name] = median_ms(samples)
+    if imports_only:
+        return result
+    for page in PAGES:
+        runs = [render(page) for _ in range(repeat)]
+        result["render"][page] = {
+            "first_run_ms": median_ms([r[0] for r in runs]),
+            "first_visit_ms": median_ms([r[1] for r in runs]),
+        }
+    return result
+
+
+def flatten(result):
+    flat = {f"import {k}": v for k, v in result["imports"].items()}
+    for page, row in result["render"].items():
+        flat.update({f"{page} {k}": v for k, v in row.items()})
+    return flat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--imports-only", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--slack-ms", type=float, default=5.0)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    result = measure(args.repeat, args.imports_only)
+    print(f"{'medida':<50}{'mediana ms':>12}")
+    for name, value in flatten(result).items():
+        print(f"{name:<50}{value:>12}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"\nbaseline gravado em {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"\nsem baseline em {args.baseline}; use --save-baseline para criar")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        before = flatten(json.load(f))
+    worse = [f"{name}: {before[name]} -> {value}" for name, value in flatten(result).items()
+             if name in before and value > before[name] * (1 + args.tolerance) + args.slack_ms]
+    if worse:
+        print("\nREGRESSÃO em relação ao baseline:")
+        for line in worse:
+            print(f"  {line}")
+        return 1
+    print("\nsem regressões em relação ao baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Módulos de apoio da plataforma ReStart 50+."""
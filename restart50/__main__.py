@@ -0,0 +1,5 @@
+import sys
+
+from restart50.cli import main
+
+sys.exit(main())
@@ -0,0 +1,155 @@
+"""Cohort analytics over every learner's quiz attempts.
+
+The store's append-only ``attempts`` table is the columnar source: one row
+per attempt with user, course, ts, score and a per-question correctness mask
+(``"101"``). Aggregates are computed with set-based SQL (GROUP BY in SQLite)
+rather than by walking the nested user dicts, and ``refresh()`` folds in
+only the rows added since the last call (rowid watermark), so keeping the
+numbers current after each new attempt costs O(new attempts). Per-question
+sums go into ``grading.ItemStats`` for difficulty and discrimination.
+"""
+import threading
+
+from restart50.grading import ItemStats
+
+PASS_SCORE = 70
+BUCKETS = 11  # 0-9, 10-19, ..., 90-99, 100
+
+
+def _empty_course():
+    return {
+        "attempts": 0,
+        "score_sum": 0,
+        "attempts_passed": 0,
+        "histogram": [0] * BUCKETS,
+        "items": ItemStats(),
+        "learners": 0,
+        "learners_passed": 0,
+    }
+
+
+class CohortAnalytics:
+    def __init__(self, store, pass_score=PASS_SCORE):
+        self.store = store
+        self.pass_score = pass_score
+        self.courses = {}
+        self.watermark = 0
+        self._best = {}  # (course_id, user_id) -> melhor nota
+        self._enrolled = {}
+        self._enrolled_watermark = 0
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Fold in attempts recorded since the last refresh; returns how many."""
+        with self._lock:
+            top = self.store.query("SELECT COALESCE(MAX(rowid), 0) FROM attempts")[0][0]
+            if top <= self.watermark:
+                return 0
+            since = self.watermark
+            new_rows = self._fold_courses(since, top)
+            self._fold_learners(since, top)
+            self.watermark = top
+            return new_rows
+
+    def _course(self, course_id):
+        return self.courses.setdefault(course_id, _empty_course())
+
+    def _fold_courses(self, since, top):
+        # Uma única varredura: contagens, histograma e somas por questão
+        # (raw = acertos da tentativa inteira, o total usado na discriminação)
+        width = self.store.query(
+            "SELECT COALESCE(MAX(length(correct)), 0) FROM attempts WHERE rowid > ? AND rowid <= ?",
+            (since, top),
+        )[0][0]
+        buckets = ", ".join(f"SUM(MIN(score / 10, 10) = {b})" for b in range(BUCKETS))
+        questions = "".join(
+            f", SUM(length(correct) >= {k}), SUM(substr(correct, {k}, 1) = '1')"
+            f", SUM(CASE WHEN length(correct) >= {k} THEN raw END)"
+            f", SUM(CASE WHEN length(correct) >= {k} THEN raw * raw END)"
+            f", SUM((substr(correct, {k}, 1) = '1') * raw)"
+            for k in range(1, width + 1)
+        )
+        rows = self.store.query(
+            f"SELECT course_id, COUNT(*), SUM(score), SUM(score >= ?), {buckets}{questions} "
+            "FROM attempts WHERE rowid > ? AND rowid <= ? GROUP BY course_id",
+            (self.pass_score, since, top),
+        )
+        total = 0
+        for course_id, count, score_sum, passed, *rest in rows:
+            agg = self._course(course_id)
+            agg["attempts"] += count
+            agg["score_sum"] += score_sum or 0
+            agg["attempts_passed"] += passed or 0
+            for b in range(BUCKETS):
+                agg["histogram"][b] += rest[b] or 0
+            per_question = rest[BUCKETS:]
+            for k in range(width):
+                sums = [v or 0 for v in per_question[5 * k:5 * k + 5]]
+                if sums[0]:
+                    agg["items"].add(k, *sums)
+            total += count
+        return total
+
+    def _fold_learners(self, since, top):
+        rows = self.store.query(
+            "SELECT course_id, user_id, MAX(score) FROM attempts "
+            "WHERE rowid > ? AND rowid <= ? GROUP BY user_id, course_id",
+            (since, top),
+        )
+        for course_id, user_id, best in rows:
+            agg = self._course(course_id)
+            key = (course_id, user_id)
+            old = self._best.get(key)
+            if old is None:
+                agg["learners"] += 1
+            elif best <= old:
+                continue
+            if best >= self.pass_score and (old is None or old < self.pass_score):
+                agg["learners_passed"] += 1
+            self._best[key] = best
+
+    # ---------- Consultas ----------
+    def enrolled(self):
+        """Enrollments per course, folding in only rows added since the last call."""
+        with self._lock:
+            rows = self.store.query(
+                "SELECT course_id, COUNT(*), MAX(rowid) FROM enrollments WHERE rowid > ? GROUP BY course_id",
+                (self._enrolled_watermark,),
+            )
+            for course_id, count, top in rows:
+                self._enrolled[course_id] = self._enrolled.get(course_id, 0) + count
+                self._enrolled_watermark = max(self._enrolled_watermark, top)
+            return self._enrolled
+
+    def course_report(self, course_id):
+        agg = self.courses.get(course_id) or _empty_course()
+        attempts = agg["attempts"]
+        return {
+            "course_id": course_id,
+            "attempts": attempts,
+            "mean_score": round(agg["score_sum"] / attempts, 1) if attempts else None,
+            "attempt_pass_rate": round(agg["attempts_passed"] / attempts, 3) if attempts else None,
+            "learners": agg["learners"],
+            "learners_passed": agg["learners_passed"],
+            "pass_rate": round(agg["learners_passed"] / agg["learners"], 3) if agg["learners"] else None,
+            "histogram": list(agg["histogram"]),
+        }
+
+    def question_difficulty(self, course_id):
+        """Share of correct answers per question (classical p-value; lower = harder)."""
+        agg = self.courses.get(course_id) or _empty_course()
+        return [round(p, 3) if p is not None else None for p in agg["items"].difficulty()]
+
+    def question_discrimination(self, course_id):
+        """Item-rest correlation per question (higher = separates strong and weak learners better)."""
+        agg = self.courses.get(course_id) or _empty_course()
+        return [round(r, 3) if r is not None else None for r in agg["items"].discrimination()]
+
+    def funnel(self, course_id):
+        agg = self.courses.get(course_id) or _empty_course()
+        enrolled = self.enrolled().get(course_id, 0)
+        return {
+            "enrolled": max(enrolled, agg["learners"]),
+            "attempted": agg["learners"],
+            "passed": agg["learners_passed"],
+        }
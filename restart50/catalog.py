@@ -0,0 +1,100 @@
+"""Course catalog loaded from ``data/courses.json``.
+
+Courses are indexed by id, category and level, so lookups are O(1). Quiz
+bodies live in ``data/quizzes/<course_id>.json`` and are only read when a
+quiz is opened. ``refresh()`` stats the catalog file and reloads it when it
+changes, so editing the JSON takes effect without restarting the app.
+
+Category/level filters are answered from facets precomputed at load time,
+and each course's card HTML is built once per catalog version. Colors and
+font size come from the theme's CSS variables, so one card fits every theme.
+"""
+import html as html_lib
+import os
+import threading
+
+from restart50.storage import load_json
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class Catalog:
+    def __init__(self, courses_file, quizzes_dir):
+        self.courses_file = courses_file
+        self.quizzes_dir = quizzes_dir
+        self.courses = []
+        self.by_id = {}
+        self.by_category = {}
+        self.by_level = {}
+        self.facets = {}
+        self.version = None
+        self._cards = {}
+        self._quizzes = {}
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self):
+        """Reload the catalog if its file changed; returns True on reload."""
+        stamp = _stamp(self.courses_file)
+        if stamp == self.version:
+            return False
+        with self._lock:
+            courses = load_json(self.courses_file) or []
+            by_id, by_category, by_level, facets = {}, {}, {}, {(None, None): courses}
+            for course in courses:
+                category, level = course.get("category"), course.get("level")
+                by_id[course["id"]] = course
+                by_category.setdefault(category, []).append(course)
+                by_level.setdefault(level, []).append(course)
+                facets.setdefault((category, level), []).append(course)
+            facets.update({(c, None): items for c, items in by_category.items()})
+            facets.update({(None, lv): items for lv, items in by_level.items()})
+            self.courses, self.by_id = courses, by_id
+            self.by_category, self.by_level, self.facets = by_category, by_level, facets
+            self._cards = {}
+            self.version = stamp
+            return True
+
+    def get(self, course_id):
+        return self.by_id.get(course_id)
+
+    def filter(self, category=None, level=None):
+        """Courses matching the given category and/or level (None = any)."""
+        return self.facets.get((category, level), [])
+
+    def card_html(self, course_id):
+        """Static part of a course card (title, level/hours, description)."""
+        card = self._cards.get(course_id)
+        if card is None:
+            c = self.by_id[course_id]
+            card = (
+                f"<div class='course-title'>{html_lib.escape(c['title'])}</div>"
+                f"<div class='muted'>{html_lib.escape(str(c.get('level', '')))} • {c.get('hours', '')}h</div>"
+                f"<p>{html_lib.escape(c.get('description', ''))}</p>"
+            )
+            self._cards[course_id] = card
+        return card
+
+    def quiz_path(self, course_id):
+        return os.path.join(self.quizzes_dir, f"{course_id}.json")
+
+    def content_version(self):
+        """Catalog version plus the stamp of every quiz file (for indexes that read quizzes)."""
+        return self.version, tuple(_stamp(self.quiz_path(c["id"])) for c in self.courses)
+
+    def quiz(self, course_id):
+        """Questions of a course, read on first use and re-read if the file changes."""
+        path = self.quiz_path(course_id)
+        stamp = _stamp(path)
+        cached = self._quizzes.get(course_id)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        questions = load_json(path) if stamp else []
+        self._quizzes[course_id] = (stamp, questions)
+        return questions
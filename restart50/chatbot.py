@@ -0,0 +1,101 @@
+"""Chatbot replies with a shared LRU/TTL response cache.
+
+Replies are cached under the normalized message (accent-folded, lowercased,
+whitespace collapsed), so the same question asked by many learners goes
+through the intent engine and the course search only once. The cache is
+cleared whenever the intent set or the course index changes version.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from random import choice
+
+from restart50 import metrics
+from restart50.text import fold
+
+_SPACES_RE = re.compile(r"\s+")
+
+
+def normalize_message(text):
+    """'  O que é   IA? ' -> 'o que e ia'"""
+    return _SPACES_RE.sub(" ", fold(text)).strip(" ?!.,;:")
+
+
+class ResponseCache:
+    def __init__(self, maxsize=1024, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.version = None
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def validate(self, version):
+        """Drop every entry if ``version`` differs from the cached one."""
+        with self._lock:
+            if version != self.version:
+                self._data.clear()
+                self.version = version
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[1] < time.monotonic():
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+
+class Chatbot:
+    def __init__(self, maxsize=1024, ttl=3600):
+        self.cache = ResponseCache(maxsize, ttl)
+        self.engine = None
+        self.index = None
+
+    def use(self, engine, index):
+        """Point the bot at the current intents and course index."""
+        self.engine = engine
+        self.index = index
+        self.cache.validate((engine.version, index.version))
+
+    def answer(self, message):
+        intent = self.engine.classify(message)
+        if intent:
+            return intent["response"]
+        found = [c["title"] for _, c in self.index.search(message, limit=3)]
+        if found:
+            return self.engine.course_suggestion.format(courses=", ".join(found))
+        return choice(self.engine.fallback)
+
+    @metrics.timed("chatbot", op="reply")
+    def reply(self, message):
+        key = normalize_message(message)
+        reply = self.cache.get(key)
+        if reply is None:
+            reply = self.answer(message)
+            self.cache.put(key, reply)
+        return reply
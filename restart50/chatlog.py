@@ -0,0 +1,126 @@
+"""Chatbot conversations kept per user, with bounded memory.
+
+Every message is appended to the store's ``chat_messages`` table, so a
+conversation survives reloads and reconnects. In memory each user only has a
+ring buffer (``deque(maxlen=recent)``) of the newest messages, and buffers
+of users not seen for a while are dropped (LRU over ``max_owners``); a
+dropped buffer is read back from SQLite on the next visit. Older messages
+are fetched page by page on demand.
+
+Guests (owners from ``guest()``) are kept in memory only: nothing can
+bring their conversation back after the session, so it is not written.
+
+The HTML of each bubble is built once per stored message and kept in a
+shared LRU, so a rerun does not escape or hash the texts again.
+"""
+import itertools
+import threading
+import uuid
+from collections import OrderedDict, deque, namedtuple
+
+Message = namedtuple("Message", "id role text ts")
+GUEST_PREFIX = "anon:"
+
+
+def guest():
+    """Owner id for a visitor without login (memory only)."""
+    return f"{GUEST_PREFIX}{uuid.uuid4().hex}"
+
+
+def is_guest(owner):
+    return owner.startswith(GUEST_PREFIX)
+
+
+class _Buffer:
+    __slots__ = ("messages", "has_older")
+
+    def __init__(self, messages, maxlen, has_older):
+        self.messages = deque(messages, maxlen=maxlen)
+        self.has_older = has_older
+
+
+class ChatLog:
+    def __init__(self, store, recent=30, max_owners=1000, max_html=4096):
+        self.store = store
+        self.recent = recent
+        self.max_owners = max_owners
+        self.max_html = max_html
+        self._buffers = OrderedDict()  # dono -> mensagens mais novas (_Buffer)
+        self._html = OrderedDict()  # id da mensagem -> HTML renderizado
+        self._guest_ids = itertools.count(-1, -1)  # ids negativos: mensagens só em memória
+        self._lock = threading.Lock()
+
+    def _buffer(self, owner):
+        buf = self._buffers.get(owner)
+        if buf is None:
+            if is_guest(owner):
+                buf = _Buffer((), self.recent, False)
+            else:
+                # Uma linha a mais só para saber se existe histórico anterior
+                rows = self.store.chat_history(owner, limit=self.recent + 1)
+                buf = _Buffer((Message(*r) for r in rows[-self.recent:]), self.recent, len(rows) > self.recent)
+            self._buffers[owner] = buf
+            if len(self._buffers) > self.max_owners:
+                self._buffers.popitem(last=False)
+        else:
+            self._buffers.move_to_end(owner)
+        return buf
+
+    def messages(self, owner):
+        """Newest messages of ``owner`` (at most ``recent``), oldest first."""
+        with self._lock:
+            return list(self._buffer(owner).messages)
+
+    def has_older(self, owner):
+        """Whether stored messages exist before the ones in ``messages(owner)``."""
+        with self._lock:
+            return self._buffer(owner).has_older
+
+    def append(self, owner, messages):
+        """Store ``(role, text, ts)`` messages and push them into the ring buffer."""
+        with self._lock:
+            buf = self._buffer(owner)
+            if is_guest(owner):
+                ids = [next(self._guest_ids) for _ in messages]
+            else:
+                ids = self.store.append_chat(owner, messages)
+                # O que sair do anel continua no banco
+                buf.has_older = buf.has_older or len(buf.messages) + len(messages) > self.recent
+            added = [Message(mid, role, text, ts) for mid, (role, text, ts) in zip(ids, messages)]
+            buf.messages.extend(added)
+        return added
+
+    def clear(self, owner, ts):
+        """Hide the conversation so far; the rows stay in the append-only log."""
+        with self._lock:
+            if not is_guest(owner):
+                self.store.append_chat(owner, [("clear", "", ts)])
+            buf = self._buffer(owner)
+            buf.messages.clear()
+            buf.has_older = False
+
+    def older(self, owner, before, limit):
+        """Up to ``limit`` messages stored before message id ``before``, oldest first."""
+        return [Message(*r) for r in self.store.chat_history(owner, before=before, limit=limit)]
+
+    def html(self, message, render):
+        """``render(message)``, computed once per stored message."""
+        with self._lock:
+            hit = self._html.get(message.id)
+            if hit is not None:
+                self._html.move_to_end(message.id)
+                return hit
+        hit = render(message)
+        with self._lock:
+            self._html[message.id] = hit
+            if len(self._html) > self.max_html:
+                self._html.popitem(last=False)
+        return hit
+
+    def stats(self):
+        with self._lock:
+            return {
+                "owners": len(self._buffers),
+                "messages": sum(len(buf.messages) for buf in self._buffers.values()),
+                "html_cached": len(self._html),
+            }
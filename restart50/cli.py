@@ -0,0 +1,196 @@
+"""Command line tools: ``python -m restart50 export|import|migrate|grade|notify-sink``."""
+import argparse
+import csv
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+from restart50 import export, grading, migrations
+from restart50.catalog import Catalog
+from restart50.storage import Store
+
+DEFAULT_DATA = os.environ.get("RESTART50_DATA_DIR", "data")
+DEFAULT_DB = os.path.join(DEFAULT_DATA, "restart50.db")
+
+
+def cmd_export(args):
+    out_dir = args.out or os.path.join("backups", time.strftime("%Y%m%d-%H%M%S"))
+    kinds = args.kind or export.KINDS
+    started = time.perf_counter()
+    written = export.export_all(args.db, out_dir, fmt=args.format, compress=not args.no_gzip, kinds=kinds)
+    for path, count in written.items():
+        print(f"{path}: {count} registros")
+    print(f"Exportação concluída em {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+def cmd_import(args):
+    store = Store(args.db, snapshot=False)
+    try:
+        for path in args.files:
+            kind = args.kind or export.detect_kind(path)
+
+            def report(total, path=path):
+                if not args.quiet:
+                    print(f"\r{path}: {total} registros", end="", file=sys.stderr, flush=True)
+
+            try:
+                count = export.import_file(store, path, kind=kind, fmt=args.format,
+                                           batch_size=args.batch_size, on_batch=report)
+            except ValueError as exc:
+                raise SystemExit(f"{path}: {exc}")
+            if not args.quiet:
+                print(file=sys.stderr)
+            print(f"{path}: {count} {kind} importados")
+    finally:
+        store.close()
+    return 0
+
+
+def cmd_migrate(args):
+    course_map = {}
+    for pair in args.map_course or ():
+        old, _, new = pair.partition("=")
+        if not new:
+            raise SystemExit(f"--map-course espera ANTIGO=NOVO, recebeu {pair!r}")
+        course_map[old] = new
+    store = Store(args.db, snapshot=False)
+    try:
+        for path in args.files:
+            def report(state):
+                if not args.quiet:
+                    print(f"\r{path}: {state['seen']} registros lidos, {state['upgraded']} convertidos",
+                          end="", file=sys.stderr, flush=True)
+
+            result = migrations.migrate_file(store, path, batch_size=args.batch_size, course_map=course_map,
+                                             force=args.force, on_batch=report)
+            if not args.quiet and not result["skipped"]:
+                print(file=sys.stderr)
+            if result["skipped"]:
+                print(f"{path}: já migrado para a versão {migrations.RECORD_VERSION}, nada a fazer (use --force)")
+            else:
+                resumed = f", retomado a partir do registro {result['resumed_from']}" if result["resumed_from"] else ""
+                print(f"{path}: {result['seen']} registros, {result['upgraded']} convertidos{resumed}")
+    finally:
+        store.close()
+    return 0
+
+
+def cmd_grade(args):
+    catalog = Catalog(os.path.join(args.data, "courses.json"), os.path.join(args.data, "quizzes"))
+    grader = grading.Grader(catalog)
+    try:
+        key = grader.key(args.course)
+    except KeyError as exc:
+        raise SystemExit(exc.args[0])
+    store = Store(args.db, snapshot=False) if args.record else None
+    out = open(args.out, "w", newline="", encoding="utf-8") if args.out else None
+    writer = csv.writer(out) if out else None
+    if writer:
+        writer.writerow(["aluno", "ts", "acertos", "nota", "correcao"])
+    # Folhas sem ts: data do arquivo + número da linha, para que repetir --record não duplique tentativas
+    base = datetime.utcfromtimestamp(int(os.path.getmtime(args.file)))
+    stats = grading.ItemStats(key.size)
+    total = score_sum = recorded = unknown = 0
+    started = time.perf_counter()
+    try:
+        with export.open_stream(args.file, "r") as fp:
+            for keys, stamps, answers in grading.read_answer_sheets(fp, batch_size=args.batch_size):
+                result = grader.grade_batch(args.course, answers)
+                stats.add_batch(result)
+                raws, scores = [int(v) for v in result.raw], [int(v) for v in result.score]
+                if writer or store:
+                    masks = grading.masks(result)
+                    stamps = [ts or (base + timedelta(microseconds=total + i)).isoformat()
+                              for i, ts in enumerate(stamps)]
+                total += len(keys)
+                score_sum += sum(scores)
+                if writer:
+                    writer.writerows(zip(keys, stamps, raws, scores, masks))
+                if store:
+                    ids = store.user_ids(keys)
+                    rows = [(ids[k], args.course, {"ts": ts, "score": sc, "raw": r, "correct": m})
+                            for k, ts, r, sc, m in zip(keys, stamps, raws, scores, masks) if k in ids]
+                    recorded += store.record_attempts(rows)
+                    unknown += len(keys) - len(rows)
+                if not args.quiet:
+                    print(f"\r{args.file}: {total} folhas corrigidas", end="", file=sys.stderr, flush=True)
+    finally:
+        if out:
+            out.close()
+        if store:
+            store.close()
+    if not args.quiet:
+        print(file=sys.stderr)
+    mean = f"{score_sum / total:.1f}" if total else "-"
+    print(f"{total} folhas corrigidas em {time.perf_counter() - started:.1f}s, nota média {mean}")
+    if args.record:
+        print(f"{recorded} tentativas gravadas, {unknown} alunos não encontrados")
+    print(f"{'questão':<10}{'acertos':>10}{'discriminação':>16}")
+    for k, (p, r) in enumerate(zip(stats.difficulty(), stats.discrimination()), start=1):
+        print(f"{k:<10}{'-' if p is None else f'{p:.0%}':>10}{'-' if r is None else f'{r:.3f}':>16}")
+    return 0
+
+
+def cmd_notify_sink(args):
+    from restart50.notify import serve_sink
+
+    server = serve_sink(args.port, host=args.host, out=args.out)
+    print(f"Recebendo notificações em http://{args.host}:{args.port}/ (Ctrl+C para sair)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m restart50", description="Ferramentas da plataforma ReStart 50+")
+    parser.add_argument("--db", default=os.environ.get("RESTART50_DB", DEFAULT_DB), help="banco SQLite (padrão: %(default)s)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("export", help="exporta usuários, contatos e tentativas em streaming")
+    p.add_argument("--out", help="diretório de saída (padrão: backups/<data-hora>)")
+    p.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    p.add_argument("--no-gzip", action="store_true", help="não comprimir os arquivos")
+    p.add_argument("--kind", action="append", choices=export.KINDS, help="exporta só este tipo (repetível)")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("import", help="importa arquivos JSONL/CSV (ou o JSON legado {id: registro})")
+    p.add_argument("files", nargs="+")
+    p.add_argument("--kind", choices=export.KINDS, help="tipo dos registros (padrão: pelo nome do arquivo)")
+    p.add_argument("--format", choices=["jsonl", "csv", "json"], help="formato (padrão: pela extensão)")
+    p.add_argument("--batch-size", type=int, default=1000)
+    p.add_argument("--quiet", action="store_true")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("migrate", help="converte arquivos de usuários do formato antigo (restart50_users.json)")
+    p.add_argument("files", nargs="+")
+    p.add_argument("--batch-size", type=int, default=500)
+    p.add_argument("--map-course", action="append", metavar="ANTIGO=NOVO", help="renomeia um id de curso (repetível)")
+    p.add_argument("--force", action="store_true", help="migra de novo mesmo que o arquivo já tenha sido processado")
+    p.add_argument("--quiet", action="store_true")
+    p.set_defaults(func=cmd_migrate)
+
+    p = sub.add_parser("grade", help="corrige em lote folhas de resposta (papel/offline) de um curso")
+    p.add_argument("course", help="id do curso (ex.: c_ai_basics)")
+    p.add_argument("file", help="CSV com coluna user_id ou email, ts opcional (padrão: data do arquivo) e uma coluna por questão (0, 1, ... ou A, B, ...)")
+    p.add_argument("--data", default=DEFAULT_DATA, help="pasta com courses.json e quizzes/ (padrão: %(default)s)")
+    p.add_argument("--out", help="grava o resultado de cada folha neste CSV")
+    p.add_argument("--record", action="store_true", help="registra as notas no perfil de cada aluno encontrado")
+    p.add_argument("--batch-size", type=int, default=50000)
+    p.add_argument("--quiet", action="store_true")
+    p.set_defaults(func=cmd_grade)
+
+    p = sub.add_parser("notify-sink", help="receptor HTTP local para testar as notificações (RESTART50_NOTIFY_URL)")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8025)
+    p.add_argument("--out", help="também grava cada notificação recebida neste arquivo JSONL")
+    p.set_defaults(func=cmd_notify_sink)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,227 @@
+"""Streaming bulk export/import of users, contacts and quiz attempts.
+
+Everything here works record by record through generators: rows are read
+from SQLite with a lazy cursor and written as JSON Lines or CSV (gzip when
+the file name ends in ``.gz``), and imports are committed in fixed-size
+batches. Memory use does not depend on the size of the database.
+"""
+import csv
+import gzip
+import json
+import os
+import sqlite3
+
+from restart50 import progress
+from restart50.storage import inline_attempts
+
+KINDS = ("users", "contacts", "attempts")
+
+CSV_FIELDS = {
+    "users": ["id", "name", "email", "joined", "progress", "stats"],
+    "contacts": ["id", "name", "email", "course", "message", "ts", "status"],
+    "attempts": ["user_id", "course_id", "ts", "score", "raw", "correct"],
+}
+# Colunas CSV que guardam JSON ou números
+_CSV_JSON = {"progress", "stats"}
+_CSV_INT = {"score", "raw"}
+
+
+def open_stream(path, mode="r", compress=None):
+    """Open ``path`` as text, transparently gzip-compressed for ``*.gz``."""
+    if compress is None:
+        compress = path.endswith(".gz")
+    if compress:
+        return gzip.open(path, mode + "t", encoding="utf-8", newline="")
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def detect_format(path):
+    name = path[:-3] if path.endswith(".gz") else path
+    ext = os.path.splitext(name)[1].lstrip(".").lower()
+    if ext not in ("jsonl", "csv", "json"):
+        raise ValueError(f"formato não reconhecido: {path}")
+    return ext
+
+
+def detect_kind(path):
+    base = os.path.basename(path).lower()
+    for kind in KINDS:
+        if kind in base:
+            return kind
+    raise ValueError(f"não sei se {path} contém users, contacts ou attempts; use --kind")
+
+
+# ------------------- Leitura do banco -------------------
+def iter_table(db_path, kind):
+    """Yield every record of ``kind`` using a separate read-only connection."""
+    conn = sqlite3.connect(f"file:{os.path.abspath(db_path)}?mode=ro", uri=True)
+    try:
+        if kind == "attempts":
+            cursor = conn.execute(
+                "SELECT user_id, course_id, ts, score, raw, correct FROM attempts ORDER BY rowid"
+            )
+            for user_id, course_id, ts, score, raw, correct in cursor:
+                yield {"user_id": user_id, "course_id": course_id, "ts": ts,
+                       "score": score, "raw": raw, "correct": correct}
+        else:
+            for (doc,) in conn.execute(f"SELECT doc FROM {kind} ORDER BY rowid"):
+                yield json.loads(doc)
+    finally:
+        conn.close()
+
+
+# ------------------- Escrita / leitura de arquivos -------------------
+def write_records(records, fp, fmt, kind):
+    count = 0
+    if fmt == "jsonl":
+        for record in records:
+            fp.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+            fp.write("\n")
+            count += 1
+    elif fmt == "csv":
+        writer = csv.DictWriter(fp, fieldnames=CSV_FIELDS[kind], extrasaction="ignore")
+        writer.writeheader()
+        for record in records:
+            row = dict(record)
+            for field in _CSV_JSON & row.keys():
+                row[field] = json.dumps(row[field], ensure_ascii=False, separators=(",", ":"))
+            writer.writerow(row)
+            count += 1
+    else:
+        raise ValueError(f"formato de exportação não suportado: {fmt}")
+    return count
+
+
+def iter_json_object(fp, chunk_size=1 << 16):
+    """Stream the values of a top-level ``{"id": record, ...}`` JSON file.
+
+    Only one chunk plus the record being decoded is held in memory, so the
+    legacy ``users.json``-style files can be read whatever their size.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def next_char():
+        nonlocal buf, pos, eof
+        while True:
+            while pos < len(buf) and buf[pos].isspace():
+                pos += 1
+            if pos < len(buf) or eof:
+                return buf[pos] if pos < len(buf) else ""
+            chunk = fp.read(chunk_size)
+            buf, pos, eof = chunk, 0, not chunk
+
+    def decode():
+        nonlocal buf, pos, eof
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+                # Só aceita o valor se o próximo caractere já está no buffer
+                rest = buf[end:].lstrip()
+                if rest or eof:
+                    pos = end
+                    return value
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            chunk = fp.read(chunk_size)
+            buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+
+    if next_char() != "{":
+        raise ValueError("esperado um objeto JSON no topo do arquivo")
+    pos += 1
+    while True:
+        ch = next_char()
+        if ch == "}":
+            return
+        if ch == ",":
+            pos += 1
+            continue
+        key = decode()
+        if next_char() != ":":
+            raise ValueError(f"JSON inválido perto da chave {key!r}")
+        pos += 1
+        next_char()
+        yield key, decode()
+
+
+def read_records(fp, fmt, kind):
+    if fmt == "jsonl":
+        for line in fp:
+            if line.strip():
+                yield json.loads(line)
+    elif fmt == "csv":
+        for row in csv.DictReader(fp):
+            for field in _CSV_JSON & row.keys():
+                row[field] = json.loads(row[field]) if row[field] else None
+            for field in _CSV_INT & row.keys():
+                row[field] = int(row[field]) if row[field] not in ("", None) else None
+            yield {k: v for k, v in row.items() if v is not None}
+    elif fmt == "json":
+        for _, record in iter_json_object(fp):
+            yield record
+    else:
+        raise ValueError(f"formato de importação não suportado: {fmt}")
+
+
+# ------------------- Operações em lote -------------------
+def export_all(db_path, out_dir, fmt="jsonl", compress=True, kinds=KINDS):
+    """Write one file per kind into ``out_dir``; returns {path: record count}."""
+    os.makedirs(out_dir, exist_ok=True)
+    written = {}
+    for kind in kinds:
+        path = os.path.join(out_dir, f"{kind}.{fmt}" + (".gz" if compress else ""))
+        tmp = path + ".partial"
+        with open_stream(tmp, "w", compress=compress) as fp:
+            count = write_records(iter_table(db_path, kind), fp, fmt, kind)
+        os.replace(tmp, path)
+        written[path] = count
+    return written
+
+
+def import_records(store, records, kind, batch_size=1000, on_batch=None):
+    """Write ``records`` of ``kind`` into ``store`` in batches; returns the count.
+
+    User records from older releases are refused (ValueError): they need
+    ``migrations.migrate_file``, which upgrades and merges them instead of
+    replacing what the store has.
+    """
+    from restart50.migrations import RECORD_VERSION, record_version
+
+    batch, total = [], 0
+
+    def flush():
+        nonlocal batch, total
+        if not batch:
+            return
+        if kind == "users":
+            for user in batch:
+                progress.user_stats(user)
+            # Arquivos {id: usuário} sem attempts.* ao lado: as tentativas inline viram histórico.
+            # Com o arquivo de tentativas também importado, a chave única descarta as repetidas.
+            store.write_batch(users=batch, attempts=inline_attempts(batch))
+        elif kind == "contacts":
+            store.write_batch(contacts=batch)
+        else:
+            store.write_batch(attempts=[(a["user_id"], a["course_id"], a) for a in batch])
+        total += len(batch)
+        batch = []
+        if on_batch:
+            on_batch(total)
+
+    for record in records:
+        if kind == "users" and record_version(record) < RECORD_VERSION:
+            raise ValueError(f"usuário {record.get('id')!r} está no formato antigo: use o comando migrate")
+        batch.append(record)
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+    return total
+
+
+def import_file(store, path, kind=None, fmt=None, batch_size=1000, on_batch=None):
+    kind = kind or detect_kind(path)
+    fmt = fmt or detect_format(path)
+    with open_stream(path, "r") as fp:
+        return import_records(store, read_records(fp, fmt, kind), kind, batch_size, on_batch)
+
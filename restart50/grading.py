@@ -0,0 +1,226 @@
+"""Quiz grading against precompiled answer keys.
+
+Each course's answer key is compiled once from its quiz file (and again only
+when that file changes), so grading a submission is a comparison against a
+ready array instead of a walk over the question dicts. The same ``Grader``
+serves the quiz form (``attempt``: one submission) and bulk grading of paper
+or offline results (``grade_batch``: a whole answers matrix at once, one row
+per submission and one column per question).
+
+With numpy the batch is a single vectorized comparison. Without it, rows are
+grouped by distinct answer pattern, which is cheap because a short quiz has
+few possible patterns. ``ItemStats`` keeps the running sums behind the
+per-question difficulty (share of correct answers) and discrimination
+(corrected item-total point-biserial correlation) statistics.
+"""
+import csv
+import math
+import threading
+from collections import Counter, namedtuple
+from datetime import datetime
+
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional
+    np = None
+
+# Resultado de grade_batch. Com numpy: arrays (raw, score) e matriz booleana
+# de acertos; sem numpy: listas, com uma máscara "101" por submissão.
+BatchResult = namedtuple("BatchResult", "raw score correct")
+
+
+def percent(raw, total):
+    """Score 0-100 from the number of correct answers (rounded down)."""
+    return raw * 100 // total if total else 0
+
+
+class AnswerKey:
+    """Correct choice index of every question of one quiz."""
+
+    def __init__(self, course_id, quiz):
+        self.course_id = course_id
+        self.quiz = quiz
+        self.answers = tuple(q["answer"] for q in quiz)
+        self.size = len(self.answers)
+        self.array = np.asarray(self.answers, dtype=np.int16) if np is not None else None
+        self._patterns = {}  # respostas -> (raw, máscara), para o caminho sem numpy
+
+    def check(self, answers):
+        """``(raw, mask)`` for one submission; memoized per answer pattern."""
+        answers = tuple(answers)
+        hit = self._patterns.get(answers)
+        if hit is None:
+            if len(answers) != self.size:
+                raise ValueError(f"{self.course_id}: esperadas {self.size} respostas, recebidas {len(answers)}")
+            mask = "".join("1" if a == k else "0" for a, k in zip(answers, self.answers))
+            hit = (mask.count("1"), mask)
+            if len(self._patterns) < 65536:
+                self._patterns[answers] = hit
+        return hit
+
+
+class Grader:
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self._keys = {}
+        self._lock = threading.Lock()
+
+    def key(self, course_id):
+        """Compiled key for a course, rebuilt when its quiz file changes."""
+        quiz = self.catalog.quiz(course_id)
+        key = self._keys.get(course_id)
+        if key is None or key.quiz is not quiz:
+            if not quiz:
+                raise KeyError(f"curso sem avaliação: {course_id}")
+            with self._lock:
+                key = self._keys[course_id] = AnswerKey(course_id, quiz)
+        return key
+
+    def attempt(self, course_id, answers, ts=None):
+        """Grade one submission into the attempt record kept by the store."""
+        key = self.key(course_id)
+        raw, mask = key.check(answers)
+        return {"ts": ts or datetime.utcnow().isoformat(), "score": percent(raw, key.size), "raw": raw, "correct": mask}
+
+    def grade_batch(self, course_id, answers_matrix):
+        """Grade many submissions at once; see ``BatchResult``.
+
+        ``answers_matrix`` has one row per submission and one choice index
+        per question; a blank answer (None or -1) counts as wrong.
+        """
+        key = self.key(course_id)
+        if key.array is not None:
+            matrix = np.asarray(answers_matrix)
+            if matrix.ndim != 2 or matrix.shape[1] != key.size:
+                raise ValueError(f"{course_id}: esperada matriz (n, {key.size}), recebida {matrix.shape}")
+            correct = matrix == key.array
+            raw = correct.sum(axis=1, dtype=np.int32)
+            return BatchResult(raw, raw * 100 // key.size, correct)
+        check = key.check
+        graded = [check(row) for row in answers_matrix]
+        raw = [r for r, _ in graded]
+        return BatchResult(raw, [percent(r, key.size) for r in raw], [m for _, m in graded])
+
+
+def masks(result):
+    """Per-submission ``"101"`` strings of a ``BatchResult`` (as stored in attempts)."""
+    correct = result.correct
+    if np is not None and isinstance(correct, np.ndarray):
+        if not len(correct):
+            return []
+        digits = np.ascontiguousarray(correct.astype(np.uint8) + ord("0"))
+        return [b.decode() for b in digits.view(f"S{correct.shape[1]}").ravel()]
+    return list(correct)
+
+
+# ------------------- Folhas de resposta (papel / offline) -------------------
+ID_COLUMNS = ("user_id", "email")
+
+
+def parse_choice(value):
+    """Choice index from a sheet cell: ``0``-based number or letter ``A``/``B``/...; blank = -1."""
+    value = (value or "").strip()
+    if not value:
+        return -1
+    if value.isdigit():
+        return int(value)
+    if len(value) == 1 and value.isalpha():
+        return ord(value.upper()) - ord("A")
+    raise ValueError(f"resposta inválida: {value!r}")
+
+
+def read_answer_sheets(fp, batch_size=50000):
+    """Yield ``(keys, timestamps, answers)`` chunks from a CSV of results.
+
+    The header names the learner column (``user_id`` or ``email``), an
+    optional ``ts`` column, and one column per question in quiz order.
+    """
+    reader = csv.reader(fp)
+    header = [h.strip() for h in next(reader, [])]
+    id_col = next((header.index(c) for c in ID_COLUMNS if c in header), None)
+    if id_col is None:
+        raise ValueError(f"cabeçalho sem coluna de aluno ({' ou '.join(ID_COLUMNS)})")
+    ts_col = header.index("ts") if "ts" in header else None
+    questions = [i for i in range(len(header)) if i not in (id_col, ts_col)]
+    keys, stamps, answers = [], [], []
+    for line, row in enumerate(reader, start=2):
+        if not any(row):
+            continue
+        try:
+            answers.append([parse_choice(row[i] if i < len(row) else "") for i in questions])
+        except ValueError as exc:
+            raise ValueError(f"linha {line}: {exc}") from None
+        keys.append(row[id_col].strip())
+        stamps.append(row[ts_col].strip() if ts_col is not None and ts_col < len(row) else None)
+        if len(keys) >= batch_size:
+            yield keys, stamps, answers
+            keys, stamps, answers = [], [], []
+    if keys:
+        yield keys, stamps, answers
+
+
+# ------------------- Estatísticas por questão -------------------
+class ItemStats:
+    """Running sums behind per-question difficulty and discrimination.
+
+    For question ``k`` it keeps, over the submissions that answered it: the
+    count ``n``, correct answers ``x``, and the totals ``t``, ``t²`` and
+    ``x·t`` (``t`` = correct answers in the whole submission). Sums merge by
+    addition, so batches and SQL aggregates fold in incrementally.
+    """
+
+    def __init__(self, size=0):
+        self.n, self.sum_x, self.sum_t, self.sum_tt, self.sum_xt = ([0] * size for _ in range(5))
+
+    def grow(self, size):
+        for values in (self.n, self.sum_x, self.sum_t, self.sum_tt, self.sum_xt):
+            values.extend([0] * (size - len(values)))
+
+    def add(self, k, n, sum_x, sum_t, sum_tt, sum_xt):
+        self.grow(k + 1)
+        self.n[k] += n
+        self.sum_x[k] += sum_x
+        self.sum_t[k] += sum_t
+        self.sum_tt[k] += sum_tt
+        self.sum_xt[k] += sum_xt
+
+    def add_batch(self, result):
+        """Fold in a ``BatchResult`` from ``Grader.grade_batch``."""
+        correct = result.correct
+        if np is not None and isinstance(correct, np.ndarray):
+            t = np.asarray(result.raw, dtype=np.int64)
+            x = correct.astype(np.int64)
+            n, sum_t, sum_tt = len(t), int(t.sum()), int(t @ t)
+            for k, (sx, sxt) in enumerate(zip(x.sum(axis=0).tolist(), (t @ x).tolist())):
+                self.add(k, n, sx, sum_t, sum_tt, sxt)
+            return
+        # Sem numpy: soma uma vez por máscara distinta, ponderada pela contagem
+        for mask, n in Counter(correct).items():
+            t = mask.count("1")
+            for k, bit in enumerate(mask):
+                x = n if bit == "1" else 0
+                self.add(k, n, x, n * t, n * t * t, x * t)
+
+    def difficulty(self):
+        """Share of correct answers per question (classical p-value; lower = harder)."""
+        return [sx / n if n else None for sx, n in zip(self.sum_x, self.n)]
+
+    def discrimination(self):
+        """Point-biserial correlation between each question and the rest of the quiz.
+
+        The question's own point is left out of the total (``t - x``) so it
+        does not inflate its correlation. None when undefined (no answers, or
+        everyone got the question or the rest equally right).
+        """
+        values = []
+        for n, sx, st, stt, sxt in zip(self.n, self.sum_x, self.sum_t, self.sum_tt, self.sum_xt):
+            if not n:
+                values.append(None)
+                continue
+            # Com r = t - x e x² = x: Σr = Σt - Σx, Σxr = Σxt - Σx, Σr² = Σt² - 2Σxt + Σx
+            sr, sxr, srr = st - sx, sxt - sx, stt - 2 * sxt + sx
+            cov = n * sxr - sx * sr
+            var_x = n * sx - sx * sx
+            var_r = n * srr - sr * sr
+            values.append(cov / math.sqrt(var_x * var_r) if var_x > 0 and var_r > 0 else None)
+        return values
@@ -0,0 +1,147 @@
+"""Local cache of resized course cover images.
+
+Each remote image is fetched once (or read from a local seed directory, for
+offline use), resized to a thumbnail and stored in ``data/images`` under a
+content-hash name. A small manifest maps source URLs to cached files, so
+later page views never touch the network. Downloads run on a small thread
+pool, never inside a page render: until a thumbnail is ready the page shows
+the remote URL. Pillow is optional: without it the original bytes are
+cached as-is.
+"""
+import hashlib
+import io
+import os
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from restart50.storage import load_json, update_json
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow é opcional
+    Image = None
+
+USER_AGENT = "ReStart50/1.0 (+image-cache)"
+RETRY_AFTER = 600  # segundos até tentar de novo uma imagem que falhou
+
+
+def url_key(url):
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+
+
+def make_thumbnail(data, width=480, fmt="WEBP", quality=80):
+    """Resize ``data`` to ``width`` px wide; returns (bytes, extension)."""
+    if Image is None:
+        return data, None
+    with Image.open(io.BytesIO(data)) as img:
+        img = img.convert("RGB")
+        if img.width > width:
+            img = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+        out = io.BytesIO()
+        img.save(out, format=fmt, quality=quality)
+    return out.getvalue(), "." + fmt.lower().replace("jpeg", "jpg")
+
+
+class ImageCache:
+    def __init__(self, cache_dir, seed_dir=None, width=480, fmt="WEBP", timeout=10, workers=4):
+        self.cache_dir = cache_dir
+        self.seed_dir = seed_dir
+        self.width = width
+        self.fmt = fmt
+        self.timeout = timeout
+        self.workers = workers
+        self.manifest_path = os.path.join(cache_dir, "manifest.json")
+        os.makedirs(cache_dir, exist_ok=True)
+        self.manifest = load_json(self.manifest_path)
+        self._failed = {}
+        self._pending = {}  # url -> Event do download em andamento (um por URL)
+        # Protege só manifesto e dicionários; nunca fica preso durante a rede
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def _read_seed(self, url):
+        if not self.seed_dir or not os.path.isdir(self.seed_dir):
+            return None
+        key = url_key(url)
+        for name in os.listdir(self.seed_dir):
+            if os.path.splitext(name)[0] == key:
+                with open(os.path.join(self.seed_dir, name), "rb") as f:
+                    return f.read()
+        return None
+
+    def _fetch(self, url):
+        data = self._read_seed(url)
+        if data is not None:
+            return data
+        req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+            return resp.read()
+
+    def cached(self, url):
+        """Path of the thumbnail for ``url`` if it is already on disk."""
+        entry = self.manifest.get(url)
+        if entry:
+            path = os.path.join(self.cache_dir, entry["file"])
+            if os.path.exists(path):
+                return path
+        return None
+
+    def thumbnail(self, url, wait=False):
+        """Path of the cached thumbnail for ``url``, or None while it is not ready.
+
+        A missing thumbnail is downloaded in the background; ``wait=True``
+        blocks until that download ends (benchmarks, scripts).
+        """
+        path = self.cached(url)
+        if path:
+            return path
+        pending = self._schedule(url)
+        if pending is None or not wait:
+            return None
+        pending.wait()
+        return self.cached(url)
+
+    def prewarm(self, urls):
+        """Start downloading every missing thumbnail; returns immediately."""
+        for url in urls:
+            if url and not self.cached(url):
+                self._schedule(url)
+
+    def _schedule(self, url):
+        with self._lock:
+            if time.monotonic() - self._failed.get(url, -RETRY_AFTER) < RETRY_AFTER:
+                return None
+            pending = self._pending.get(url)
+            if pending is None:
+                pending = self._pending[url] = threading.Event()
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="restart50-images")
+                self._pool.submit(self._download, url, pending)
+            return pending
+
+    def _download(self, url, pending):
+        try:
+            source = self._fetch(url)
+            data, ext = make_thumbnail(source, self.width, self.fmt)
+            name = hashlib.sha256(data).hexdigest()[:20] + (ext or os.path.splitext(url.split("?")[0])[1] or ".img")
+            path = os.path.join(self.cache_dir, name)
+            if not os.path.exists(path):
+                with open(path, "wb") as f:
+                    f.write(data)
+            entry = {"file": name, "source_bytes": len(source), "bytes": len(data)}
+
+            def add(manifest):
+                manifest[url] = entry
+
+            with self._lock:
+                # Relê o manifesto sob o lock do arquivo: não apaga o que outro processo gravou
+                self.manifest = update_json(self.manifest_path, add)
+        except Exception:
+            with self._lock:
+                self._failed[url] = time.monotonic()
+        finally:
+            with self._lock:
+                self._pending.pop(url, None)
+            pending.set()
@@ -0,0 +1,53 @@
+"""Data-driven intent classifier for the chatbot.
+
+Intents are loaded from ``data/intents.json`` and compiled into a single
+regular expression with one named group per intent. Keywords are matched on
+whole words of the accent-folded message, so "ia" no longer fires inside
+"dia" or "importancia". When several intents match, the one listed first in
+the file wins, as in the original if/elif chain.
+"""
+import hashlib
+import json
+import re
+
+from restart50.text import fold
+
+
+class IntentEngine:
+    def __init__(self, intents, course_suggestion="", fallback=(), version=""):
+        self.intents = list(intents)
+        self.course_suggestion = course_suggestion
+        self.fallback = list(fallback)
+        self.version = version
+        groups = []
+        for i, intent in enumerate(self.intents):
+            # Frases mais longas primeiro, para "internet das coisas" vencer "coisas"
+            words = sorted({fold(k) for k in intent["keywords"]}, key=len, reverse=True)
+            alternatives = "|".join(re.escape(w).replace(r"\ ", r"\s+") for w in words)
+            groups.append(f"(?P<i{i}>{alternatives})")
+        self._pattern = re.compile(r"\b(?:" + "|".join(groups) + r")\b") if groups else None
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "rb") as f:
+            raw = f.read()
+        data = json.loads(raw.decode("utf-8"))
+        return cls(
+            data.get("intents", []),
+            course_suggestion=data.get("course_suggestion", ""),
+            fallback=data.get("fallback", []),
+            version=hashlib.sha1(raw).hexdigest(),
+        )
+
+    def classify(self, text):
+        """Return the matching intent dict (highest priority) or None."""
+        if self._pattern is None:
+            return None
+        best = None
+        for match in self._pattern.finditer(fold(text)):
+            index = int(match.lastgroup[1:])
+            if best is None or index < best:
+                best = index
+                if best == 0:
+                    break
+        return self.intents[best] if best is not None else None
@@ -0,0 +1,250 @@
+"""Process-wide timing spans and counters.
+
+Code under measurement wraps itself in ``span("name")`` (or the ``timed``
+decorator) and bumps counters with ``incr``. Everything lands in one
+thread-safe ``Registry`` shared by all sessions, which can be rendered as
+Prometheus text or JSON lines, served over HTTP, or appended to a file.
+
+Collection is on by default and costs two ``perf_counter`` calls and a lock
+per span; set ``RESTART50_METRICS=0`` to turn it into no-ops.
+"""
+import bisect
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+log = logging.getLogger(__name__)
+
+# Limites dos buckets de latência, em segundos
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# Amostras recentes guardadas por série para os percentis do painel
+RESERVOIR = 512
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    body = ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in pairs)
+    return "{" + body + "}"
+
+
+class _Series:
+    __slots__ = ("count", "total", "max", "buckets", "recent")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.recent = deque(maxlen=RESERVOIR)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.recent.append(seconds)
+
+    def quantile(self, q):
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Registry:
+    def __init__(self, prefix="restart50", enabled=True):
+        self.prefix = prefix
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._spans = {}
+        self._counters = {}
+        self._collectors = []
+
+    # ---------- Registro ----------
+    def observe(self, name, seconds, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            series = self._spans.get(key)
+            if series is None:
+                series = self._spans[key] = _Series()
+            series.observe(seconds)
+
+    @contextmanager
+    def span(self, name, **labels):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def timed(self, name, **labels):
+        """Decorator form of ``span``."""
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - start, **labels)
+            return wrapper
+        return decorate
+
+    def incr(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def add_collector(self, fn):
+        """``fn()`` returns ``{gauge_name: value}``, read at export time."""
+        self._collectors.append(fn)
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+
+    # ---------- Leitura ----------
+    def snapshot(self):
+        """Plain-data view: ``{"spans": [...], "counters": [...], "gauges": [...]}``."""
+        with self._lock:
+            spans = [
+                {"name": name, "labels": dict(key), "count": s.count, "sum": s.total, "max": s.max,
+                 "p50": s.quantile(0.5), "p95": s.quantile(0.95), "p99": s.quantile(0.99)}
+                for (name, key), s in sorted(self._spans.items())
+            ]
+            counters = [{"name": name, "labels": dict(key), "value": value}
+                        for (name, key), value in sorted(self._counters.items())]
+        gauges = []
+        for collect in self._collectors:
+            try:
+                values = collect() or {}
+            except Exception:  # um coletor com defeito não derruba a exportação
+                continue
+            gauges.extend({"name": name, "labels": {}, "value": value} for name, value in sorted(values.items()))
+        return {"ts": time.time(), "spans": spans, "counters": counters, "gauges": gauges}
+
+    def prometheus(self):
+        """Prometheus text exposition format (histograms, counters, gauges)."""
+        lines = []
+        with self._lock:
+            spans = sorted((name, key, s.count, s.total, list(s.buckets)) for (name, key), s in self._spans.items())
+            counters = sorted(self._counters.items())
+        typed = set()
+        for name, key, count, total, buckets in spans:
+            metric = f"{self.prefix}_{name}_seconds".replace(".", "_")
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} histogram")
+                typed.add(metric)
+            cumulative = 0
+            for bound, hits in zip(BUCKETS + ("+Inf",), buckets):
+                cumulative += hits
+                lines.append(f"{metric}_bucket{_format_labels(key, [('le', bound)])} {cumulative}")
+            lines.append(f"{metric}_sum{_format_labels(key)} {total:.6f}")
+            lines.append(f"{metric}_count{_format_labels(key)} {count}")
+        for (name, key), value in counters:
+            metric = f"{self.prefix}_{name}_total".replace(".", "_")
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} counter")
+                typed.add(metric)
+            lines.append(f"{metric}{_format_labels(key)} {value}")
+        for gauge in self.snapshot()["gauges"]:
+            metric = f"{self.prefix}_{gauge['name']}".replace(".", "_")
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {gauge['value']}")
+        return "\n".join(lines) + "\n"
+
+    def json_line(self):
+        return json.dumps(self.snapshot(), separators=(",", ":"))
+
+    # ---------- Exportação ----------
+    def serve(self, port, host="127.0.0.1"):
+        """Expose ``/metrics`` (Prometheus) and ``/metrics.json`` on a daemon thread."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/metrics.json"):
+                    body, ctype = registry.json_line().encode(), "application/json"
+                elif self.path.startswith("/metrics"):
+                    body, ctype = registry.prometheus().encode(), "text/plain; version=0.0.4"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="restart50-metrics", daemon=True).start()
+        return server
+
+    def append_jsonl(self, path, interval=60.0):
+        """Append one snapshot line to ``path`` every ``interval`` seconds."""
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        def run():
+            while True:
+                time.sleep(interval)
+                # Disco cheio ou pasta removida: registra e tenta de novo no próximo intervalo
+                try:
+                    with open(path, "a", encoding="utf-8") as f:
+                        f.write(self.json_line() + "\n")
+                except OSError:
+                    log.exception("métricas: falha ao gravar %s", path)
+
+        thread = threading.Thread(target=run, name="restart50-metrics-file", daemon=True)
+        thread.start()
+        return thread
+
+
+class Stopwatch:
+    """Times consecutive sections of a script: each ``lap`` closes the previous one."""
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+        self.started = self._last = time.perf_counter()
+
+    def lap(self, section):
+        now = time.perf_counter()
+        if self.registry.enabled:
+            self.registry.observe(self.name, now - self._last, section=section)
+        self._last = now
+
+    def total(self):
+        return time.perf_counter() - self.started
+
+
+REGISTRY = Registry(enabled=os.environ.get("RESTART50_METRICS", "1") != "0")
+span = REGISTRY.span
+timed = REGISTRY.timed
+incr = REGISTRY.incr
@@ -0,0 +1,133 @@
+"""Versioned migrations for user records written by older releases.
+
+The first MVP saved ``restart50_users.json`` with ``age``/``interests``/
+``pace`` at the top level, ``progress`` as ``{course_id: bool}`` and quiz
+scores in a top-level ``quizzes`` list. Each step in ``STEPS`` upgrades a
+record by one version; ``migrate_file`` streams a legacy file through them
+and merges the result into the store in batches.
+
+Runs are idempotent: merging keeps whatever the store already has and only
+fills in what is missing, and finished files (identified by a digest of
+their contents) are skipped. An interrupted run resumes after the last
+committed batch.
+"""
+import copy
+import hashlib
+from datetime import datetime
+
+from restart50 import progress
+from restart50.export import iter_json_object, open_stream
+
+LEGACY_PROFILE_FIELDS = ("age", "interests", "pace")
+
+
+# ------------------- Passos de migração -------------------
+def _v0_to_v1(user, course_map):
+    """Legacy MVP layout -> nested ``progress`` entries and a ``profile`` dict."""
+    profile = {key: user.pop(key) for key in LEGACY_PROFILE_FIELDS if key in user}
+    quizzes = user.pop("quizzes", None)
+    if quizzes:
+        # Sem curso nem data: guardadas como estavam, não viram tentativas
+        profile["legacy_quiz_scores"] = [q.get("score") for q in quizzes if isinstance(q, dict)]
+    entries = {}
+    for course_id, value in (user.get("progress") or {}).items():
+        entry = progress.new_entry()
+        if isinstance(value, dict):
+            entry.update(value)
+        else:
+            entry["completed"] = bool(value)
+        entries[course_map.get(course_id, course_id)] = entry
+    user["progress"] = entries
+    if profile:
+        user["profile"] = profile
+
+
+STEPS = [_v0_to_v1]
+RECORD_VERSION = len(STEPS)
+
+
+def record_version(user):
+    if any(key in user for key in LEGACY_PROFILE_FIELDS + ("quizzes",)):
+        return 0
+    if any(not isinstance(v, dict) for v in (user.get("progress") or {}).values()):
+        return 0
+    return RECORD_VERSION
+
+
+def migrate_record(user, course_map=None):
+    """Return ``user`` upgraded to ``RECORD_VERSION`` (a new dict)."""
+    user = copy.deepcopy(user)
+    for step in STEPS[record_version(user):]:
+        step(user, course_map or {})
+    user.pop("stats", None)
+    return user
+
+
+def merge_user(current, migrated):
+    """Fold a migrated record into the stored one; stored values win."""
+    for key, value in migrated.items():
+        if key == "progress":
+            entries = current.setdefault("progress", {})
+            for course_id, entry in value.items():
+                existing = entries.setdefault(course_id, entry)
+                if existing is not entry and entry.get("completed"):
+                    existing["completed"] = True
+        elif key == "profile":
+            current.setdefault("profile", {})
+            for field, field_value in value.items():
+                current["profile"].setdefault(field, field_value)
+        elif current.get(key) in (None, ""):
+            current[key] = value
+    current["stats"] = progress.compute_stats(current.get("progress", {}))
+
+
+# ------------------- Execução -------------------
+def file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.sha1()
+    with open(path, "rb") as fp:
+        for chunk in iter(lambda: fp.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def migrate_file(store, path, batch_size=500, course_map=None, force=False, on_batch=None):
+    """Stream a legacy ``{id: user}`` file into ``store``.
+
+    Returns a report dict with the number of records ``seen``, ``upgraded``
+    (they needed at least one step), ``resumed_from`` and whether the file
+    was ``skipped`` because it had already been migrated.
+    """
+    source = file_digest(path)
+    report = {"path": path, "seen": 0, "upgraded": 0, "resumed_from": 0, "skipped": False}
+    state = None if force else store.migration_state(source)
+    if state and state[0] >= RECORD_VERSION and state[2]:
+        report["skipped"] = True
+        return report
+    if state and state[0] == RECORD_VERSION:
+        report["resumed_from"] = state[1]
+
+    batch = []
+
+    def flush():
+        if batch:
+            store.apply_user_deltas(batch, cache=False)
+            batch.clear()
+        store.save_migration_state(source, path, RECORD_VERSION, report["seen"])
+        if on_batch:
+            on_batch(report)
+
+    with open_stream(path, "r") as fp:
+        for key, record in iter_json_object(fp):
+            report["seen"] += 1
+            if report["seen"] <= report["resumed_from"] or not isinstance(record, dict):
+                continue
+            record.setdefault("id", key)
+            if record_version(record) < RECORD_VERSION:
+                report["upgraded"] += 1
+            migrated = migrate_record(record, course_map)
+            batch.append((migrated["id"], lambda user, m=migrated: merge_user(user, m), None))
+            if len(batch) >= batch_size:
+                flush()
+    flush()
+    store.save_migration_state(source, path, RECORD_VERSION, report["seen"], datetime.utcnow().isoformat())
+    return report
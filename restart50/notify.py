@@ -0,0 +1,274 @@
+"""Instructor notifications for contact messages, delivered from an outbox.
+
+``Store.put_contact`` writes the message and its outbox rows in one
+transaction, so the form returns as soon as SQLite commits. A ``Dispatcher``
+thread then claims due rows, groups them per instructor into one digest and
+hands each digest to a transport:
+
+- ``SMTPTransport`` keeps one SMTP connection open and reuses it between
+  digests, reconnecting when the server drops it;
+- ``WebhookTransport`` POSTs JSON over a keep-alive HTTP(S) connection.
+
+New rows become due ``digest_window`` seconds after they are written, which
+is what lets several messages to the same instructor share one e-mail.
+Failed deliveries are retried with exponential backoff and jitter, and given
+up (``failed``) after ``max_attempts``. ``python -m restart50 notify-sink``
+runs a local HTTP endpoint that prints what it receives, for testing.
+"""
+import atexit
+import http.client
+import json
+import logging
+import random
+import smtplib
+import threading
+import time
+from datetime import datetime
+from email.message import EmailMessage
+from urllib.parse import urlsplit
+
+from restart50 import metrics
+
+log = logging.getLogger(__name__)
+
+
+# ------------------- Transportes -------------------
+class SMTPTransport:
+    def __init__(self, host, port=587, username=None, password=None, sender=None, starttls=True,
+                 timeout=20, idle_timeout=60):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.sender = sender or username or "restart50@localhost"
+        self.starttls = starttls
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self._conn = None
+        self._last_used = 0.0
+
+    def _connection(self):
+        if self._conn is not None and time.monotonic() - self._last_used > self.idle_timeout:
+            self.close()
+        if self._conn is None:
+            conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                conn.starttls()
+            if self.username:
+                conn.login(self.username, self.password or "")
+            self._conn = conn
+        return self._conn
+
+    def send(self, recipient, subject, text, payload):
+        msg = EmailMessage()
+        msg["From"] = self.sender
+        msg["To"] = recipient
+        msg["Subject"] = subject
+        msg.set_content(text)
+        for attempt in range(2):
+            try:
+                self._connection().send_message(msg)
+                self._last_used = time.monotonic()
+                return
+            except smtplib.SMTPServerDisconnected:
+                # Conexão reaproveitada caiu: reconecta uma vez
+                self._conn = None
+                if attempt:
+                    raise
+
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._conn.quit()
+            except Exception:
+                pass
+            self._conn = None
+
+
+class WebhookTransport:
+    def __init__(self, url, timeout=10, headers=None):
+        parts = urlsplit(url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.timeout = timeout
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        self._conn = None
+
+    def _connection(self):
+        if self._conn is None:
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            self._conn = cls(self.host, self.port, timeout=self.timeout)
+        return self._conn
+
+    def send(self, recipient, subject, text, payload):
+        body = json.dumps({"to": recipient, "subject": subject, "text": text, **payload}, ensure_ascii=False).encode()
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request("POST", self.path, body=body, headers=self.headers)
+                resp = conn.getresponse()
+                resp.read()
+            except (http.client.HTTPException, ConnectionError):
+                # Keep-alive fechado pelo servidor: abre outra conexão uma vez
+                self.close()
+                if attempt:
+                    raise
+                continue
+            if resp.status >= 300:
+                raise RuntimeError(f"webhook respondeu {resp.status}")
+            return
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# ------------------- Resumo por instrutor -------------------
+def digest(messages):
+    """Subject and plain-text body for one instructor's pending messages."""
+    n = len(messages)
+    subject = "[ReStart 50+] Nova mensagem de aluno" if n == 1 else f"[ReStart 50+] {n} novas mensagens de alunos"
+    parts = []
+    for m in messages:
+        when = (m.get("ts") or "").replace("T", " ")[:16]
+        parts.append(f"{m.get('name')} <{m.get('email')}> — {m.get('course')} — {when}\n{m.get('message')}")
+    text = "\n\n---\n\n".join(parts) + "\n\nResponda pelo Painel do Instrutor na plataforma ReStart 50+.\n"
+    return subject, text
+
+
+# ------------------- Despachante -------------------
+class Dispatcher:
+    def __init__(self, store, transport, recipients, digest_window=60, batch_size=200,
+                 max_attempts=8, base_delay=5, max_delay=3600, lease=300):
+        self.store = store
+        self.transport = transport
+        self.recipients = sorted(recipients)
+        self.digest_window = digest_window
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lease = lease
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="restart50-notify", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def outbox_rows(self, msg):
+        """Outbox rows for ``Store.put_contact``: one per instructor."""
+        payload = {k: msg.get(k) for k in ("id", "name", "email", "course", "message", "ts")}
+        due = time.time() + self.digest_window
+        return [(recipient, payload, due) for recipient in self.recipients]
+
+    def wake(self):
+        """Ask the worker to recompute when the next row is due."""
+        self._wake.set()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=10)
+        self.transport.close()
+
+    def backoff(self, attempts):
+        delay = min(self.max_delay, self.base_delay * 2 ** attempts)
+        return delay * random.uniform(0.5, 1.0)
+
+    def deliver_due(self, now=None):
+        """Send every due digest once; returns the number of messages delivered."""
+        now = time.time() if now is None else now
+        rows = self.store.claim_notifications(now, limit=self.batch_size, lease=self.lease)
+        by_recipient = {}
+        for oid, recipient, payload, attempts in rows:
+            by_recipient.setdefault(recipient, []).append((oid, payload, attempts))
+        sent, retry, failed = [], [], []
+        for recipient, items in by_recipient.items():
+            subject, text = digest([payload for _, payload, _ in items])
+            try:
+                with metrics.span("notify", op="send"):
+                    self.transport.send(recipient, subject, text, {"messages": [p for _, p, _ in items]})
+            except Exception as exc:
+                log.warning("notificação para %s falhou: %s", recipient, exc)
+                error = f"{type(exc).__name__}: {exc}"[:500]
+                for oid, _, attempts in items:
+                    if attempts + 1 >= self.max_attempts:
+                        failed.append((oid, error))
+                    else:
+                        retry.append((oid, now + self.backoff(attempts), error))
+                continue
+            sent.extend(oid for oid, _, _ in items)
+        if rows:
+            self.store.finish_notifications(sent=sent, retry=retry, failed=failed, ts=datetime.utcnow().isoformat())
+            metrics.incr("notifications", len(sent), result="sent")
+            metrics.incr("notifications", len(retry), result="retry")
+            metrics.incr("notifications", len(failed), result="failed")
+        return len(sent)
+
+    def _run(self):
+        while not self._closed:
+            try:
+                while self.deliver_due() and not self._closed:
+                    pass
+                due = self.store.next_notification_time()
+            except Exception:
+                log.exception("despachante de notificações")
+                due = None
+            timeout = 30.0 if due is None else min(30.0, max(0.0, due - time.time()))
+            self._wake.wait(timeout)
+            self._wake.clear()
+
+
+def from_env(store, recipients, env):
+    """Build a Dispatcher from RESTART50_SMTP_* / RESTART50_NOTIFY_URL, or None."""
+    if not recipients:
+        return None
+    if env.get("RESTART50_NOTIFY_URL"):
+        transport = WebhookTransport(env["RESTART50_NOTIFY_URL"])
+    elif env.get("RESTART50_SMTP_HOST"):
+        transport = SMTPTransport(
+            env["RESTART50_SMTP_HOST"],
+            port=int(env.get("RESTART50_SMTP_PORT", "587")),
+            username=env.get("RESTART50_SMTP_USER"),
+            password=env.get("RESTART50_SMTP_PASSWORD"),
+            sender=env.get("RESTART50_SMTP_FROM"),
+            starttls=env.get("RESTART50_SMTP_TLS", "1") != "0",
+        )
+    else:
+        return None
+    return Dispatcher(
+        store, transport, recipients,
+        digest_window=float(env.get("RESTART50_NOTIFY_DIGEST_S", "60")),
+        max_attempts=int(env.get("RESTART50_NOTIFY_MAX_ATTEMPTS", "8")),
+    )
+
+
+# ------------------- Receptor local para testes -------------------
+def serve_sink(port=8025, host="127.0.0.1", out=None):
+    """Local webhook stand-in: prints (and optionally appends to ``out``) each POST."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # mantém a conexão aberta, como um servidor real
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            data = json.loads(body or b"{}")
+            print(f"-> {data.get('to')}: {data.get('subject')} ({len(data.get('messages', []))} mensagem(ns))", flush=True)
+            if out:
+                with open(out, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(data, ensure_ascii=False) + "\n")
+            self.send_response(204)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    return server
@@ -0,0 +1,115 @@
+"""Per-user progress changes and running aggregates.
+
+Besides the per-course ``progress`` entries, each user carries a ``stats``
+summary updated the moment an attempt is recorded:
+
+    {"completed": 2, "score_sum": 166, "score_count": 2, "last_attempt_ts": "..."}
+
+``score_sum``/``score_count`` cover the current score of each course (the
+latest attempt), matching the dashboard's average. Users saved before the
+summary existed get it computed once, on first access.
+
+Only the last ``keep`` attempts of a course stay inline; older ones are
+folded into ``entry["rollup"]`` (count, best, mean, first/last ts). The
+full history lives in the store's append-only ``attempts`` table.
+"""
+
+ATTEMPTS_INLINE = 10
+
+
+def new_entry():
+    return {"completed": False, "score": None, "attempts": []}
+
+
+def compute_stats(progress):
+    """Build the summary from scratch (used for backfill)."""
+    stats = {"completed": 0, "score_sum": 0, "score_count": 0, "last_attempt_ts": None}
+    for entry in progress.values():
+        if not isinstance(entry, dict):
+            continue
+        if entry.get("completed"):
+            stats["completed"] += 1
+        if entry.get("score") is not None:
+            stats["score_sum"] += entry["score"]
+            stats["score_count"] += 1
+        rolled_up = (entry.get("rollup") or {}).get("last_ts")
+        for ts in [rolled_up] + [a.get("ts") for a in entry.get("attempts", [])]:
+            if ts and (stats["last_attempt_ts"] is None or ts > stats["last_attempt_ts"]):
+                stats["last_attempt_ts"] = ts
+    return stats
+
+
+def user_stats(user):
+    if "stats" not in user:
+        user["stats"] = compute_stats(user.get("progress", {}))
+    return user["stats"]
+
+
+def catalog_stats(user, course_ids):
+    """Running stats restricted to ``course_ids``.
+
+    The stored summary covers every progress entry, including courses no
+    longer in the catalog (e.g. migrated legacy ids); those few entries are
+    subtracted here instead of recomputing the whole summary.
+    """
+    stats = dict(user_stats(user))
+    for course_id, entry in (user.get("progress") or {}).items():
+        if course_id in course_ids or not isinstance(entry, dict):
+            continue
+        if entry.get("completed"):
+            stats["completed"] -= 1
+        if entry.get("score") is not None:
+            stats["score_sum"] -= entry["score"]
+            stats["score_count"] -= 1
+    return stats
+
+
+def average_score(stats):
+    return int(stats["score_sum"] / stats["score_count"]) if stats["score_count"] else None
+
+
+def enroll(user, course_id):
+    user_stats(user)
+    user.setdefault("progress", {}).setdefault(course_id, new_entry())
+
+
+def rollup_attempts(entry, keep=ATTEMPTS_INLINE):
+    """Fold all but the last ``keep`` inline attempts into the rollup (``keep=0``: all of them)."""
+    attempts = entry["attempts"]
+    if len(attempts) <= keep:
+        return
+    # attempts[:-0] seria vazio: com keep=0 tudo vai para o resumo
+    split = len(attempts) - keep
+    older, entry["attempts"] = attempts[:split], attempts[split:]
+    rollup = entry.setdefault("rollup", {
+        "count": 0, "best": None, "score_sum": 0, "mean": None, "first_ts": None, "last_ts": None,
+    })
+    for a in older:
+        score = a.get("score") or 0
+        rollup["count"] += 1
+        rollup["score_sum"] += score
+        rollup["best"] = score if rollup["best"] is None else max(rollup["best"], score)
+        ts = a.get("ts")
+        if ts and (rollup["first_ts"] is None or ts < rollup["first_ts"]):
+            rollup["first_ts"] = ts
+        if ts and (rollup["last_ts"] is None or ts > rollup["last_ts"]):
+            rollup["last_ts"] = ts
+    rollup["mean"] = round(rollup["score_sum"] / rollup["count"], 1)
+
+
+def record_attempt(user, course_id, attempt, keep=ATTEMPTS_INLINE):
+    stats = user_stats(user)
+    entry = user.setdefault("progress", {}).setdefault(course_id, new_entry())
+    if not entry["completed"]:
+        stats["completed"] += 1
+    if entry["score"] is None:
+        stats["score_count"] += 1
+    else:
+        stats["score_sum"] -= entry["score"]
+    stats["score_sum"] += attempt["score"]
+    if stats["last_attempt_ts"] is None or attempt["ts"] > stats["last_attempt_ts"]:
+        stats["last_attempt_ts"] = attempt["ts"]
+    entry["attempts"].append(attempt)
+    entry["score"] = attempt["score"]
+    entry["completed"] = True
+    rollup_attempts(entry, keep)
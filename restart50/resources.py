@@ -0,0 +1,166 @@
+"""Settings and process-wide resources shared by the app and its pages.
+
+Every resource is built on first use and kept with ``st.cache_resource``.
+Modules that only one page needs (analytics, grading, search, intents,
+chatbot, images) are imported inside their factory, so a rerun only pays
+for what the active page touches.
+"""
+import os
+
+import streamlit as st
+
+from restart50 import metrics
+from restart50.catalog import Catalog
+from restart50.storage import Store, normalize_email
+
+# ------------------- Diretórios / Dados -------------------
+# RESTART50_DATA_DIR aponta para outra pasta de dados (testes de carga, ambientes separados)
+DATA_DIR = os.environ.get("RESTART50_DATA_DIR", "data")
+USERS_FILE = os.path.join(DATA_DIR, "users.json")
+CONTACTS_FILE = os.path.join(DATA_DIR, "contacts.json")
+INTENTS_FILE = os.path.join(DATA_DIR, "intents.json")
+COURSES_FILE = os.path.join(DATA_DIR, "courses.json")
+QUIZZES_DIR = os.path.join(DATA_DIR, "quizzes")
+COURSES_PER_PAGE = int(os.environ.get("RESTART50_COURSES_PER_PAGE", "6"))
+INBOX_PAGE_SIZE = 20
+# E-mails (separados por vírgula) com acesso ao Painel do Instrutor
+INSTRUCTORS = {normalize_email(e) for e in os.environ.get("RESTART50_INSTRUCTORS", "").split(",") if e.strip()}
+DB_FILE = os.path.join(DATA_DIR, "restart50.db")
+IMAGES_DIR = os.path.join(DATA_DIR, "images")
+IMAGES_SEED_DIR = os.environ.get("RESTART50_IMAGE_SEED_DIR")
+
+
+# ------------------- Recursos compartilhados -------------------
+@st.cache_resource
+def store():
+    """One store per process; imports the JSON files on first run."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    db = Store(DB_FILE, USERS_FILE, CONTACTS_FILE,
+               attempts_inline=int(os.environ.get("RESTART50_ATTEMPTS_INLINE", "10")))
+    # Matrículas e tentativas são gravadas em lote por uma thread em segundo plano
+    db.start_write_behind(
+        window=float(os.environ.get("RESTART50_WRITE_WINDOW_MS", "50")) / 1000,
+        max_batch=int(os.environ.get("RESTART50_WRITE_BATCH", "500")),
+        maxsize=int(os.environ.get("RESTART50_WRITE_QUEUE", "10000")),
+    )
+    return db
+
+
+@st.cache_resource
+def analytics():
+    """Cohort aggregates, updated incrementally from the attempts log."""
+    from restart50.analytics import CohortAnalytics
+
+    return CohortAnalytics(store())
+
+
+@st.cache_resource
+def catalog():
+    """Course catalog shared by all sessions; quizzes load on demand."""
+    return Catalog(COURSES_FILE, QUIZZES_DIR)
+
+
+@st.cache_resource
+def grader():
+    """Answer keys compiled once per quiz file, shared by the form and bulk grading."""
+    from restart50.grading import Grader
+
+    return Grader(catalog())
+
+
+@st.cache_resource(max_entries=2)
+def course_index(version):
+    """Inverted index over the catalog and its quizzes, keyed on ``Catalog.content_version()``."""
+    from restart50.search import CourseIndex
+
+    courses = [dict(c, quiz=catalog().quiz(c["id"])) for c in catalog().courses]
+    return CourseIndex(courses, version=version)
+
+
+@st.cache_resource(max_entries=2)
+def intent_engine(mtime):
+    """Chatbot intents compiled from data/intents.json, reloaded when the file changes."""
+    from restart50.intents import IntentEngine
+
+    return IntentEngine.from_file(INTENTS_FILE)
+
+
+@st.cache_resource
+def image_cache():
+    """Course cover thumbnails stored in data/images."""
+    from restart50.images import ImageCache
+
+    os.makedirs(IMAGES_DIR, exist_ok=True)
+    cache = ImageCache(IMAGES_DIR, seed_dir=IMAGES_SEED_DIR)
+    # Baixa as capas que faltam em segundo plano; a página usa a URL remota até lá
+    cache.prewarm(c.get("image") for c in catalog().courses)
+    return cache
+
+
+@st.cache_resource
+def chatbot():
+    """Shared across sessions so the response cache serves every learner."""
+    from restart50.chatbot import Chatbot
+
+    return Chatbot(maxsize=2048, ttl=6 * 3600)
+
+
+@st.cache_resource
+def chat_log():
+    """Chat conversations per user: bounded ring buffers over the append-only log."""
+    from restart50.chatlog import ChatLog
+
+    return ChatLog(
+        store(),
+        recent=int(os.environ.get("RESTART50_CHAT_RECENT", "30")),
+        max_owners=int(os.environ.get("RESTART50_CHAT_USERS", "1000")),
+    )
+
+
+@st.cache_resource
+def notifier():
+    """Background dispatcher for instructor e-mails/webhooks, or None when not configured.
+
+    The main script calls this on every run, so pending outbox rows are
+    delivered after a restart even before a new message arrives.
+    """
+    if not INSTRUCTORS or not (os.environ.get("RESTART50_NOTIFY_URL") or os.environ.get("RESTART50_SMTP_HOST")):
+        return None  # sem transporte configurado: nem importa o módulo
+    from restart50 import notify
+
+    return notify.from_env(store(), INSTRUCTORS, os.environ)
+
+
+@st.cache_resource
+def metrics_exporter():
+    """Process-wide gauges plus the optional Prometheus endpoint / JSON-lines file."""
+    registry = metrics.REGISTRY
+    db = store()
+    registry.add_collector(lambda: {f"writebehind_{k}": v for k, v in db.writer.metrics().items()} if db.writer else {})
+    registry.add_collector(lambda: {f"chatbot_cache_{k}": v for k, v in chatbot().cache.stats().items()})
+    registry.add_collector(lambda: {f"chatlog_{k}": v for k, v in chat_log().stats().items()})
+    registry.add_collector(lambda: {"snapshot_users": len(db.users), "snapshot_contacts": len(db.contacts)})
+    registry.add_collector(lambda: {f"outbox_{k}": v for k, v in db.outbox_stats().items()})
+    port = os.environ.get("RESTART50_METRICS_PORT")
+    if port:
+        registry.serve(int(port), host=os.environ.get("RESTART50_METRICS_HOST", "127.0.0.1"))
+    path = os.environ.get("RESTART50_METRICS_FILE")
+    if path:
+        registry.append_jsonl(path, interval=float(os.environ.get("RESTART50_METRICS_INTERVAL", "60")))
+    return registry
+
+
+# ------------------- Auxiliares -------------------
+def safe_rerun():
+    """Try modern rerun, fallback to experimental if needed."""
+    try:
+        st.rerun()
+    except Exception:
+        try:
+            st.experimental_rerun()
+        except Exception:
+            pass
+
+
+def is_instructor(user):
+    return bool(user) and normalize_email(user.get("email")) in INSTRUCTORS
@@ -0,0 +1,62 @@
+"""Inverted index with BM25 ranking over the course catalog.
+
+The index is built once from titles, descriptions and quiz text. A query only
+touches the posting lists of its own terms, so its cost does not grow with
+the size of the catalog.
+"""
+import math
+
+from restart50.text import tokenize
+
+# Peso de cada campo na frequência do termo (BM25F simplificado)
+FIELD_WEIGHTS = {"title": 3.0, "description": 1.0, "quiz": 0.5}
+
+
+def _course_fields(course):
+    quiz = " ".join(
+        " ".join([q.get("q", "")] + list(q.get("choices", [])))
+        for q in course.get("quiz", [])
+    )
+    return {
+        "title": course.get("title", ""),
+        "description": " ".join([course.get("description", ""), course.get("category", "")]),
+        "quiz": quiz,
+    }
+
+
+class CourseIndex:
+    def __init__(self, courses, k1=1.2, b=0.75, version=None):
+        self.courses = list(courses)
+        self.version = version
+        self.k1 = k1
+        self.b = b
+        self.postings = {}
+        self.doc_len = []
+        for doc_id, course in enumerate(self.courses):
+            tf = {}
+            for field, text in _course_fields(course).items():
+                weight = FIELD_WEIGHTS[field]
+                for term in tokenize(text):
+                    tf[term] = tf.get(term, 0.0) + weight
+            self.doc_len.append(sum(tf.values()))
+            for term, freq in tf.items():
+                self.postings.setdefault(term, []).append((doc_id, freq))
+        n = len(self.courses)
+        self.avg_len = (sum(self.doc_len) / n) if n else 0.0
+        self.idf = {
+            term: math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+
+    def search(self, query, limit=3):
+        """Return up to ``limit`` ``(score, course)`` pairs, best first."""
+        scores = {}
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, freq in self.postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_len[doc_id] / self.avg_len)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * freq * (self.k1 + 1) / (freq + norm)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [(score, self.courses[doc_id]) for doc_id, score in ranked]
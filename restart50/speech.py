@@ -0,0 +1,66 @@
+"""Text-to-speech bridge: one component per page instead of one iframe per button.
+
+``listen_button`` renders a plain "🔊 Ouvir" link (regular markdown, no
+iframe) and registers its text. ``render`` then sends every registered text
+to a single custom component, which speaks through the browser's
+SpeechSynthesis API when one of the links is clicked.
+"""
+import hashlib
+import html as html_lib
+import os
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+_COMPONENT_DIR = os.path.join(os.path.dirname(__file__), "components", "speech")
+_speech_component = components.declare_component("restart50_speech", path=_COMPONENT_DIR)
+
+# Opções do seletor "Voz preferida" -> preferência usada no navegador
+VOICES = {"Mulher": "female", "Homem": "male", "Padrão": "default"}
+
+
+def speech_id(text):
+    return hashlib.md5(text.encode("utf-8")).hexdigest()[:12]
+
+
+def listen_link(text):
+    """``(sid, text, html)`` of a "🔊 Ouvir" link; pure, so callers may cache it."""
+    text = " ".join(text.split())
+    sid = speech_id(text)
+    html = (
+        f'<a class="listen-btn" role="button" tabindex="0" data-speak="{sid}" '
+        f'aria-label="Ouvir: {html_lib.escape(text[:80], quote=True)}">🔊 Ouvir</a>'
+    )
+    return sid, text, html
+
+
+class SpeechBridge:
+    """Collects the speakable texts of one script run."""
+
+    def __init__(self):
+        self.texts = {}
+        self.autoplay = None
+
+    def add(self, sid, text):
+        """Register a text whose id came from ``listen_link``."""
+        self.texts[sid] = text
+
+    def listen_button(self, text):
+        if not text:
+            return
+        sid, text, html = listen_link(text)
+        self.add(sid, text)
+        st.markdown(html, unsafe_allow_html=True)
+
+    def speak_now(self, text, nonce):
+        """Read ``text`` aloud once, as soon as the bridge renders."""
+        self.autoplay = {"text": " ".join(text.split()), "nonce": nonce}
+
+    def render(self, voice="Mulher"):
+        _speech_component(
+            texts=self.texts,
+            voice=VOICES.get(voice, "default"),
+            autoplay=self.autoplay,
+            key="restart50_speech",
+            default=None,
+        )
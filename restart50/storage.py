@@ -0,0 +1,838 @@
+"""SQLite-backed repository for users and contact messages.
+
+Every write touches a single row, so enrolling in a course or saving a quiz
+attempt no longer rewrites every user. The JSON files in ``data/`` remain the
+import/export format.
+
+The store also keeps a process-wide in-memory snapshot (``users`` and
+``contacts``) that is only re-read when another connection commits. Changes
+to an existing user go through ``update_user``, which re-reads the row inside
+a write transaction and applies only the caller's delta, so concurrent
+sessions (threads or processes) never overwrite each other's attempts.
+
+Two secondary indexes are maintained alongside the snapshot: normalized
+e-mail -> user id, and e-mail -> contact ids ordered by ``ts``.
+
+Every quiz attempt is also appended to the ``attempts`` table, the full
+history; user records only keep the most recent attempts inline.
+"""
+import bisect
+import copy
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+
+from restart50 import metrics, progress
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    email TEXT,
+    doc TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS contacts (
+    id TEXT PRIMARY KEY,
+    email TEXT,
+    ts TEXT,
+    doc TEXT NOT NULL,
+    course TEXT,
+    status TEXT
+);
+CREATE TABLE IF NOT EXISTS attempts (
+    user_id TEXT NOT NULL,
+    course_id TEXT NOT NULL,
+    ts TEXT,
+    score INTEGER,
+    raw INTEGER,
+    correct TEXT
+);
+CREATE TABLE IF NOT EXISTS migrations (
+    source TEXT PRIMARY KEY,
+    path TEXT,
+    version INTEGER NOT NULL,
+    done INTEGER NOT NULL,
+    finished TEXT
+);
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recipient TEXT NOT NULL,
+    contact_id TEXT,
+    payload TEXT NOT NULL,
+    created TEXT NOT NULL,
+    next_try REAL NOT NULL,
+    leased REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    sent TEXT,
+    failed TEXT
+);
+CREATE TABLE IF NOT EXISTS enrollments (
+    user_id TEXT NOT NULL,
+    course_id TEXT NOT NULL,
+    UNIQUE (user_id, course_id)
+);
+CREATE TABLE IF NOT EXISTS chat_messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    owner TEXT NOT NULL,
+    role TEXT NOT NULL,
+    text TEXT NOT NULL,
+    ts TEXT
+);
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS users_email ON users (email);
+-- Chave natural do histórico: reimportar um backup não duplica tentativas
+CREATE UNIQUE INDEX IF NOT EXISTS attempts_key ON attempts (user_id, course_id, ts);
+CREATE INDEX IF NOT EXISTS contacts_email_ts ON contacts (email, ts);
+CREATE INDEX IF NOT EXISTS contacts_course_status_ts ON contacts (course, status, ts, id);
+CREATE INDEX IF NOT EXISTS contacts_status_ts ON contacts (status, ts, id);
+CREATE INDEX IF NOT EXISTS contacts_ts ON contacts (ts, id);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (next_try) WHERE sent IS NULL AND failed IS NULL;
+CREATE INDEX IF NOT EXISTS outbox_recipient ON outbox (recipient, next_try) WHERE sent IS NULL AND failed IS NULL;
+CREATE INDEX IF NOT EXISTS chat_owner ON chat_messages (owner, id);
+CREATE INDEX IF NOT EXISTS chat_clears ON chat_messages (owner, id) WHERE role = 'clear';
+"""
+
+SCHEMA_VERSION = 4
+
+# Fluxo das mensagens na caixa do instrutor: só avança
+CONTACT_STATUSES = ["novo", "respondido", "fechado"]
+
+
+def normalize_email(email):
+    return (email or "").strip().lower()
+
+
+def _dumps(doc):
+    return json.dumps(doc, ensure_ascii=False, separators=(",", ":"))
+
+
+def inline_attempts(users):
+    """``(user_id, course_id, attempt)`` for the attempts kept inside user records."""
+    rows = []
+    for user in users:
+        for course_id, entry in (user.get("progress") or {}).items():
+            if isinstance(entry, dict):
+                rows.extend((user["id"], course_id, a) for a in entry.get("attempts", []))
+    return rows
+
+
+class Store:
+    """Small repository API over a SQLite database in WAL mode."""
+
+    def __init__(self, db_path, users_file=None, contacts_file=None, attempts_inline=progress.ATTEMPTS_INLINE,
+                 snapshot=True):
+        if attempts_inline < 0:
+            raise ValueError(f"attempts_inline deve ser >= 0, recebido {attempts_inline}")
+        self.path = db_path
+        self.attempts_inline = attempts_inline
+        # snapshot=False: sem cópia em memória (ferramentas de linha de comando, lotes grandes)
+        self.snapshot = snapshot
+        self.users = {}
+        self.contacts = {}
+        self._user_by_email = {}
+        self._contacts_by_email = {}
+        self._version = None
+        self.writer = None
+        # Deltas já aplicados ao snapshot e ainda na fila do writer, em ordem
+        self._pending = {}
+        self._lock = threading.RLock()
+        # timeout: espera o lock de escrita de outros processos em vez de falhar
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        # Primeira execução: importa os arquivos JSON existentes
+        if self.count("users") == 0 and self.count("contacts") == 0:
+            self.import_json(users_file, contacts_file)
+            self._set_schema_version(SCHEMA_VERSION)
+        self._upgrade_schema()
+        self.refresh()
+
+    def _upgrade_schema(self):
+        version = self.schema_version()
+        if version < 1:
+            # Bancos criados antes do histórico completo: arquiva as tentativas existentes
+            self._archive_inline_attempts(self.load_users().values())
+        if version < 2:
+            columns = [row[1] for row in self.query("PRAGMA table_info(attempts)")]
+            if "correct" not in columns:
+                self._conn.execute("ALTER TABLE attempts ADD COLUMN correct TEXT")
+        if version < 3:
+            columns = [row[1] for row in self.query("PRAGMA table_info(contacts)")]
+            if "status" not in columns:
+                self._conn.execute("ALTER TABLE contacts ADD COLUMN course TEXT")
+                self._conn.execute("ALTER TABLE contacts ADD COLUMN status TEXT")
+                self._conn.execute(
+                    "UPDATE contacts SET course = json_extract(doc, '$.course'), "
+                    "status = COALESCE(json_extract(doc, '$.status'), 'novo')"
+                )
+        if version < 4:
+            # Matrículas passam a ter tabela própria: preenche a partir dos documentos uma única vez
+            self._conn.execute(
+                "INSERT OR IGNORE INTO enrollments (user_id, course_id) "
+                "SELECT users.id, p.key FROM users, json_each(users.doc, '$.progress') AS p"
+            )
+        if not self.query("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'attempts_key'"):
+            # Antes da chave única: remove duplicatas de importações repetidas (vale também para bancos novos)
+            self._conn.execute(
+                "DELETE FROM attempts WHERE ts IS NOT NULL AND rowid NOT IN "
+                "(SELECT MIN(rowid) FROM attempts GROUP BY user_id, course_id, ts)"
+            )
+            self._conn.execute("DROP INDEX IF EXISTS attempts_user_course")
+        self._conn.executescript(INDEXES)
+        self._set_schema_version(SCHEMA_VERSION)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        with self._lock:
+            self._conn.close()
+
+    def data_version(self):
+        """SQLite's counter of commits made by *other* connections."""
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    @metrics.timed("storage", op="refresh")
+    def refresh(self):
+        """Reload the in-memory snapshot if the database changed elsewhere.
+
+        Returns True when a reload happened. Writes made through this store
+        update the snapshot directly and do not trigger a reload.
+        """
+        if not self.snapshot:
+            return False
+        with self._lock:
+            version = self.data_version()
+            if version == self._version:
+                return False
+            self.users = self.load_users()
+            self.contacts = self.load_contacts()
+            self._rebuild_indexes()
+            self._reapply_pending()
+            self._version = version
+            return True
+
+    def _reapply_pending(self):
+        # O disco ainda não tem o que está na fila do writer: reaplica no snapshot recarregado
+        for user_id, apply, default in self._pending.values():
+            user = self.users.get(user_id)
+            if user is None:
+                user = copy.deepcopy(default) if default else {"id": user_id}
+            apply(user)
+            self._cache_user(user)
+
+    # ---------- Índices ----------
+    def _rebuild_indexes(self):
+        self._user_by_email = {}
+        for uid, user in self.users.items():
+            email = normalize_email(user.get("email"))
+            if email:
+                self._user_by_email[email] = uid
+        self._contacts_by_email = {}
+        for mid, msg in self.contacts.items():
+            self._contacts_by_email.setdefault(normalize_email(msg.get("email")), []).append((msg.get("ts") or "", mid))
+        for entries in self._contacts_by_email.values():
+            entries.sort()
+
+    def _index_user(self, user):
+        old = self.users.get(user["id"])
+        old_email = normalize_email(old.get("email")) if old else ""
+        email = normalize_email(user.get("email"))
+        if old_email and old_email != email and self._user_by_email.get(old_email) == user["id"]:
+            del self._user_by_email[old_email]
+        if email:
+            self._user_by_email[email] = user["id"]
+
+    def _index_contact(self, msg):
+        old = self.contacts.get(msg["id"])
+        if old:
+            old_entries = self._contacts_by_email.get(normalize_email(old.get("email")), [])
+            key = (old.get("ts") or "", msg["id"])
+            i = bisect.bisect_left(old_entries, key)
+            if i < len(old_entries) and old_entries[i] == key:
+                del old_entries[i]
+        entries = self._contacts_by_email.setdefault(normalize_email(msg.get("email")), [])
+        bisect.insort(entries, (msg.get("ts") or "", msg["id"]))
+
+    def find_user_by_email(self, email):
+        uid = self._user_by_email.get(normalize_email(email))
+        return self.users.get(uid) if uid else None
+
+    def recent_contacts(self, email, limit=5):
+        """Newest ``limit`` messages sent from ``email``."""
+        entries = self._contacts_by_email.get(normalize_email(email), [])
+        return [self.contacts[mid] for _, mid in reversed(entries[-limit:])]
+
+    def schema_version(self):
+        with self._lock:
+            return self._conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def _set_schema_version(self, version):
+        with self._lock:
+            self._conn.execute(f"PRAGMA user_version = {int(version)}")
+
+    @metrics.timed("storage", op="query")
+    def query(self, sql, params=()):
+        """Run a read-only query on the store's connection."""
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def count(self, table):
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    # ---------- Usuários ----------
+    @metrics.timed("storage", op="get_user")
+    def get_user(self, user_id):
+        with self._lock:
+            row = self._conn.execute("SELECT doc FROM users WHERE id = ?", (user_id,)).fetchone()
+        if row is None:
+            return None
+        metrics.incr("storage_bytes_read", len(row[0]), table="users")
+        return json.loads(row[0])
+
+    @metrics.timed("storage", op="load_users")
+    def load_users(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT id, doc FROM users").fetchall()
+        metrics.incr("storage_bytes_read", sum(len(doc) for _, doc in rows), table="users")
+        return {uid: json.loads(doc) for uid, doc in rows}
+
+    def _write_user(self, user):
+        doc = _dumps(user)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO users (id, email, doc) VALUES (?, ?, ?)",
+            (user["id"], normalize_email(user.get("email")), doc),
+        )
+        # Só matrículas novas ganham linha (e rowid novo): a contagem por curso é incremental
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO enrollments (user_id, course_id) VALUES (?, ?)",
+            [(user["id"], course_id) for course_id in user.get("progress") or {}],
+        )
+        metrics.incr("storage_bytes_written", len(doc), table="users")
+
+    def _cache_user(self, user):
+        if not self.snapshot:
+            return
+        self._index_user(user)
+        self.users[user["id"]] = user
+
+    @metrics.timed("storage", op="put_user")
+    def put_user(self, user):
+        with self._lock:
+            self._write_user(user)
+            self._cache_user(user)
+
+    def update_user(self, user_id, apply, default=None):
+        """Apply ``apply(user)`` to the latest stored version of a user.
+
+        The row is read and written inside ``BEGIN IMMEDIATE``, which holds
+        SQLite's inter-process write lock, so the delta is merged into
+        whatever other sessions committed in the meantime.
+        """
+        return self.apply_user_deltas([(user_id, apply, default)])[user_id]
+
+    @metrics.timed("storage", op="apply_user_deltas")
+    def apply_user_deltas(self, deltas, cache=True):
+        """Merge a batch of ``(user_id, apply, default)`` deltas in one transaction.
+
+        With ``cache=False`` the in-memory snapshot is left alone; the
+        write-behind path has already applied the deltas there.
+        """
+        with self._lock:
+            changed = {}
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                archived = []
+                for user_id, apply, default in deltas:
+                    user = changed.get(user_id) or self.get_user(user_id)
+                    if user is None:
+                        user = copy.deepcopy(default) if default else {"id": user_id}
+                    # Um delta pode devolver tentativas para o histórico completo
+                    for course_id, attempt in apply(user) or ():
+                        archived.append((user_id, course_id, attempt))
+                    changed[user_id] = user
+                for user in changed.values():
+                    self._write_user(user)
+                self._archive_attempts(archived)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            if cache:
+                for user in changed.values():
+                    self._cache_user(user)
+            return changed
+
+    # ---------- Gravação em segundo plano ----------
+    def start_write_behind(self, window=0.05, max_batch=500, maxsize=10000):
+        """Persist enrollments and attempts from a background batching thread."""
+        from restart50.writebehind import WriteBehind
+
+        self.writer = WriteBehind(self._write_pending, window=window, max_batch=max_batch, maxsize=maxsize,
+                                  on_drop=self._drop_pending)
+        return self.writer
+
+    def _write_pending(self, batch):
+        # Commit e saída da lista de pendentes sob o mesmo lock que o refresh usa
+        with self._lock:
+            try:
+                self.apply_user_deltas(batch, cache=False)
+            finally:
+                for event in batch:
+                    self._pending.pop(id(event), None)
+
+    def _drop_pending(self, events):
+        # O writer desistiu destes eventos: o snapshot volta a refletir o disco no próximo refresh
+        with self._lock:
+            for event in events:
+                self._pending.pop(id(event), None)
+            self._version = None
+        metrics.incr("storage_writes_dropped", len(events))
+
+    def _change_user(self, user_id, apply, default):
+        if self.writer is None:
+            return self.update_user(user_id, apply, default)
+        # Aplica no snapshot agora; o disco é atualizado pelo writer
+        with self._lock:
+            user = self.users.get(user_id)
+            if user is None:
+                user = copy.deepcopy(default) if default else {"id": user_id}
+            apply(user)
+            self._cache_user(user)
+            event = (user_id, apply, default)
+            self._pending[id(event)] = event
+        self.writer.submit(event)
+        return user
+
+    def enroll(self, user_id, course_id, default=None):
+        return self._change_user(user_id, lambda user: progress.enroll(user, course_id), default)
+
+    def record_attempt(self, user_id, course_id, attempt, default=None):
+        def apply(user):
+            progress.record_attempt(user, course_id, attempt, keep=self.attempts_inline)
+            return [(course_id, attempt)]
+        return self._change_user(user_id, apply, default)
+
+    def record_attempts(self, rows):
+        """Record many ``(user_id, course_id, attempt)`` in one transaction (bulk grading).
+
+        An attempt already in the history (same user, course and ts) is
+        skipped, so recording the same sheets twice changes nothing.
+        Returns the number of attempts recorded.
+        """
+        known = self._archived_keys(rows)
+        fresh = {}
+        for uid, cid, a in rows:
+            key = (uid, cid, a.get("ts"))
+            if key not in known:
+                fresh.setdefault(key, (uid, cid, a))
+        rows = list(fresh.values())
+
+        def delta(course_id, attempt):
+            def apply(user):
+                progress.record_attempt(user, course_id, attempt, keep=self.attempts_inline)
+                return [(course_id, attempt)]
+            return apply
+        self.apply_user_deltas([(uid, delta(cid, a), None) for uid, cid, a in rows])
+        return len(rows)
+
+    def user_ids(self, keys):
+        """Map user ids or e-mails to stored user ids; unknown keys are left out."""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            marks = ", ".join("?" * len(chunk))
+            emails = [normalize_email(k) for k in chunk]
+            rows = self.query(f"SELECT id, email FROM users WHERE id IN ({marks}) OR email IN ({marks})", chunk + emails)
+            by_email = {email: uid for uid, email in rows}
+            ids = {uid for uid, _ in rows}
+            for key, email in zip(chunk, emails):
+                uid = key if key in ids else by_email.get(email)
+                if uid:
+                    found[key] = uid
+        return found
+
+    # ---------- Histórico de tentativas ----------
+    def _archived_keys(self, rows):
+        keys = set()
+        users = list({uid for uid, _, _ in rows})
+        courses = list({cid for _, cid, _ in rows})
+        for start in range(0, len(users), 500):
+            chunk = users[start:start + 500]
+            found = self.query(
+                f"SELECT user_id, course_id, ts FROM attempts WHERE user_id IN ({', '.join('?' * len(chunk))}) "
+                f"AND course_id IN ({', '.join('?' * len(courses))})",
+                chunk + courses,
+            )
+            keys.update(found)
+        return keys
+
+    def _archive_attempts(self, rows):
+        # OR IGNORE: (user_id, course_id, ts) já gravado é a mesma tentativa
+        before = self._conn.total_changes
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO attempts (user_id, course_id, ts, score, raw, correct) VALUES (?, ?, ?, ?, ?, ?)",
+            [(uid, cid, a.get("ts"), a.get("score"), a.get("raw"), a.get("correct")) for uid, cid, a in rows],
+        )
+        metrics.incr("attempts_archived", self._conn.total_changes - before)
+
+    def _archive_inline_attempts(self, users):
+        with self._lock:
+            self._archive_attempts(inline_attempts(users))
+
+    @metrics.timed("storage", op="attempt_history")
+    def attempt_history(self, user_id, course_id):
+        """Full attempt history of a course, oldest first (read on demand)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ts, score, raw FROM attempts WHERE user_id = ? AND course_id = ? ORDER BY ts",
+                (user_id, course_id),
+            ).fetchall()
+        return [{"ts": ts, "score": score, "raw": raw} for ts, score, raw in rows]
+
+    # ---------- Mensagens ----------
+    @metrics.timed("storage", op="load_contacts")
+    def load_contacts(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT id, doc FROM contacts").fetchall()
+        metrics.incr("storage_bytes_read", sum(len(doc) for _, doc in rows), table="contacts")
+        return {mid: json.loads(doc) for mid, doc in rows}
+
+    @metrics.timed("storage", op="put_contact")
+    def put_contact(self, msg, outbox=()):
+        """Store a message; ``outbox`` rows are queued for delivery in the same transaction.
+
+        Each outbox row is ``(recipient, payload, next_try)``: the payload is
+        any JSON-serializable dict and ``next_try`` an epoch timestamp.
+        """
+        doc = _dumps(msg)
+        with self._lock:
+            if outbox:
+                self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO contacts (id, email, ts, doc, course, status) VALUES (?, ?, ?, ?, ?, ?)",
+                    (msg["id"], normalize_email(msg.get("email")), msg.get("ts"), doc,
+                     msg.get("course"), msg.get("status") or "novo"),
+                )
+                if outbox:
+                    self._conn.executemany(
+                        "INSERT INTO outbox (recipient, contact_id, payload, created, next_try) VALUES (?, ?, ?, ?, ?)",
+                        [(recipient, msg["id"], _dumps(payload), msg.get("ts") or "", next_try)
+                         for recipient, payload, next_try in outbox],
+                    )
+                    self._conn.execute("COMMIT")
+            except Exception:
+                if outbox:
+                    self._conn.execute("ROLLBACK")
+                raise
+            metrics.incr("storage_bytes_written", len(doc), table="contacts")
+            if self.snapshot:
+                self._index_contact(msg)
+                self.contacts[msg["id"]] = msg
+
+    @metrics.timed("storage", op="find_contacts")
+    def find_contacts(self, course=None, status=None, since=None, until=None, after=None, limit=50):
+        """One page of messages, newest first, using keyset pagination.
+
+        ``since``/``until`` are ISO timestamps (``until`` exclusive). Pass the
+        returned cursor as ``after`` to get the next page; it is None on the
+        last page.
+        """
+        where, params = [], []
+        for column, value in (("course", course), ("status", status)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            where.append("ts >= ?")
+            params.append(since)
+        if until:
+            where.append("ts < ?")
+            params.append(until)
+        if after:
+            where.append("(ts, id) < (?, ?)")
+            params.extend(after)
+        sql = "SELECT id, ts, doc FROM contacts"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY ts DESC, id DESC LIMIT ?"
+        rows = self.query(sql, (*params, limit + 1))
+        page = [json.loads(doc) for _, _, doc in rows[:limit]]
+        cursor = (rows[limit - 1][1], rows[limit - 1][0]) if len(rows) > limit else None
+        return page, cursor
+
+    @metrics.timed("storage", op="set_contact_status")
+    def set_contact_status(self, ids, status):
+        """Move messages forward in the novo -> respondido -> fechado flow.
+
+        Messages already at or past ``status`` are left alone. Returns the
+        number of messages changed.
+        """
+        if status not in CONTACT_STATUSES:
+            raise ValueError(f"status desconhecido: {status}")
+        earlier = CONTACT_STATUSES[:CONTACT_STATUSES.index(status)]
+        ids = list(ids)
+        if not ids or not earlier:
+            return 0
+        changed = 0
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for start in range(0, len(ids), 500):
+                    chunk = ids[start:start + 500]
+                    marks = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        f"UPDATE contacts SET status = ?, doc = json_set(doc, '$.status', ?) "
+                        f"WHERE id IN ({marks}) AND status IN ({','.join('?' * len(earlier))}) RETURNING id",
+                        (status, status, *chunk, *earlier),
+                    ).fetchall()
+                    for (mid,) in rows:
+                        if mid in self.contacts:
+                            self.contacts[mid]["status"] = status
+                    changed += len(rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return changed
+
+    @metrics.timed("storage", op="write_batch")
+    def write_batch(self, users=(), contacts=(), attempts=()):
+        """Write many records in one transaction (bulk import).
+
+        ``attempts`` are ``(user_id, course_id, attempt)`` tuples appended to
+        the history table; ones already there (same user, course and ts)
+        are skipped.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for user in users:
+                    self.put_user(user)
+                for msg in contacts:
+                    self.put_contact(msg)
+                self._archive_attempts(attempts)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    # ---------- Notificações (outbox) ----------
+    def claim_notifications(self, now, limit=100, lease=300):
+        """Pending outbox rows as ``(id, recipient, payload, attempts)``, leased to the caller.
+
+        Every recipient with at least one due row gets *all* of its pending
+        rows, so messages still inside the digest window travel together.
+        The rows are leased until ``now + lease`` in the same transaction, so
+        a dispatcher in another server process skips them meanwhile.
+        """
+        free = "sent IS NULL AND failed IS NULL AND (leased IS NULL OR leased <= :now)"
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    f"SELECT id, recipient, payload, attempts FROM outbox WHERE {free} AND recipient IN "
+                    f"(SELECT DISTINCT recipient FROM outbox WHERE {free} AND next_try <= :now) "
+                    "ORDER BY next_try LIMIT :limit",
+                    {"now": now, "limit": limit},
+                ).fetchall()
+                self._conn.executemany("UPDATE outbox SET leased = ? WHERE id = ?", [(now + lease, r[0]) for r in rows])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [(oid, recipient, json.loads(payload), attempts) for oid, recipient, payload, attempts in rows]
+
+    def finish_notifications(self, sent=(), retry=(), failed=(), ts=None):
+        """Record delivery results.
+
+        ``sent`` is a list of ids; ``retry`` holds ``(id, next_try, error)``
+        and ``failed`` holds ``(id, error)`` for rows that gave up.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany("UPDATE outbox SET sent = ?, leased = NULL, error = NULL WHERE id = ?", [(ts, oid) for oid in sent])
+                self._conn.executemany(
+                    "UPDATE outbox SET attempts = attempts + 1, next_try = ?, leased = NULL, error = ? WHERE id = ?",
+                    [(next_try, error, oid) for oid, next_try, error in retry],
+                )
+                self._conn.executemany(
+                    "UPDATE outbox SET attempts = attempts + 1, failed = ?, leased = NULL, error = ? WHERE id = ?",
+                    [(ts, error, oid) for oid, error in failed],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def next_notification_time(self):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT MIN(MAX(next_try, COALESCE(leased, 0))) FROM outbox WHERE sent IS NULL AND failed IS NULL"
+            ).fetchone()[0]
+
+    def outbox_stats(self):
+        with self._lock:
+            pending, sent, failed = self._conn.execute(
+                "SELECT COUNT(*) - COUNT(sent) - COUNT(failed), COUNT(sent), COUNT(failed) FROM outbox"
+            ).fetchone()
+        return {"pending": pending, "sent": sent, "failed": failed}
+
+    # ---------- Conversas do chatbot ----------
+    @metrics.timed("storage", op="append_chat")
+    def append_chat(self, owner, messages):
+        """Append ``(role, text, ts)`` rows to a chat log; returns their ids.
+
+        The table is append-only: clearing a conversation appends a
+        ``"clear"`` row and reads stop there.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                ids = [
+                    self._conn.execute(
+                        "INSERT INTO chat_messages (owner, role, text, ts) VALUES (?, ?, ?, ?)", (owner, role, text, ts)
+                    ).lastrowid
+                    for role, text, ts in messages
+                ]
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        metrics.incr("storage_bytes_written", sum(len(text) for _, text, _ in messages), table="chat_messages")
+        return ids
+
+    @metrics.timed("storage", op="chat_history")
+    def chat_history(self, owner, before=None, limit=30):
+        """Newest ``limit`` messages since the last clear, older than id ``before``; oldest first.
+
+        Rows are ``(id, role, text, ts)``; keyset pagination on ``id``.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, role, text, ts FROM chat_messages WHERE owner = :owner AND id < :before "
+                "AND id > (SELECT COALESCE(MAX(id), 0) FROM chat_messages WHERE owner = :owner AND role = 'clear') "
+                "ORDER BY id DESC LIMIT :limit",
+                {"owner": owner, "before": before if before is not None else 2 ** 63 - 1, "limit": limit},
+            ).fetchall()
+        metrics.incr("storage_bytes_read", sum(len(r[2]) for r in rows), table="chat_messages")
+        rows.reverse()
+        return rows
+
+    # ---------- Migrações de arquivos legados ----------
+    def migration_state(self, source):
+        """``(version, done, finished)`` recorded for a source file digest, or None."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT version, done, finished FROM migrations WHERE source = ?", (source,)
+            ).fetchone()
+
+    def save_migration_state(self, source, path, version, done, finished=None):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO migrations (source, path, version, done, finished) VALUES (?, ?, ?, ?, ?)",
+                (source, path, version, done, finished),
+            )
+
+    # ---------- Importação / exportação JSON ----------
+    def import_json(self, users_file=None, contacts_file=None):
+        """Load records from the legacy ``{id: record}`` JSON files."""
+        users = load_json(users_file)
+        contacts = load_json(contacts_file)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for user in users.values():
+                    self.put_user(user)
+                self._archive_inline_attempts(users.values())
+                for msg in contacts.values():
+                    self.put_contact(msg)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(users), len(contacts)
+
+    def export_json(self, users_file=None, contacts_file=None):
+        """Write the database back out in the legacy JSON layout."""
+        if users_file:
+            save_json(users_file, self.load_users())
+        if contacts_file:
+            save_json(contacts_file, self.load_contacts())
+
+
+# ------------------- Arquivos JSON -------------------
+@contextmanager
+def file_lock(path):
+    """Exclusive inter-process lock on ``path + '.lock'``."""
+    with open(path + ".lock", "a+b") as lock:
+        if fcntl:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        else:
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+            else:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@metrics.timed("storage", op="load_json")
+def load_json(path):
+    """Read a JSON file; a missing file is empty, a corrupt one raises."""
+    if not path or not os.path.exists(path):
+        return {}
+    metrics.incr("json_bytes_read", os.path.getsize(path))
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _atomic_write_json(path, data):
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        metrics.incr("json_bytes_written", os.path.getsize(path))
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+@metrics.timed("storage", op="save_json")
+def save_json(path, data):
+    """Write via temp file + fsync + os.replace, so readers never see a partial file."""
+    with file_lock(path):
+        _atomic_write_json(path, data)
+
+
+def update_json(path, apply):
+    """Merge-on-write: re-read ``path`` under the lock, apply a delta, save."""
+    with file_lock(path):
+        data = load_json(path)
+        apply(data)
+        _atomic_write_json(path, data)
+        return data
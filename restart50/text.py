@@ -0,0 +1,35 @@
+"""Text normalization shared by the chatbot and the course search."""
+import re
+import unicodedata
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a ao aos as com como da das de do dos e em eu isso minha minhas meu meus na nas no nos
+o os ou para pela pelas pelo pelos por qual quais que se sem seu sua sobre um uma umas uns
+voce voces ter tem ser sao esta estao ja mais muito pode posso quero gostaria saber
+""".split())
+
+
+_PT_ACCENTS = str.maketrans("áàâãäéèêëíìîïóòôõöúùûüç", "aaaaaeeeeiiiiooooouuuuc")
+
+
+def fold(text):
+    """Lowercase and strip accents: 'Inteligência' -> 'inteligencia'."""
+    text = (text or "").lower().translate(_PT_ACCENTS)
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def stem(word):
+    # Plural simples do português: "dados" -> "dado", "graficos" -> "grafico"
+    if len(word) > 3 and word.endswith("s"):
+        return word[:-1]
+    return word
+
+
+def tokenize(text):
+    """Folded, stopword-free, lightly stemmed tokens."""
+    return [stem(w) for w in _WORD_RE.findall(fold(text)) if w not in STOPWORDS]
@@ -0,0 +1,124 @@
+"""Theme stylesheet for the platform.
+
+The stylesheet is static and reads everything from CSS variables; only the
+small ``:root`` block depends on the user's settings (high contrast and font
+size, 12-28px in steps of 2). Every variant is precomputed and memoized, so
+a click on the font buttons no longer rebuilds the whole ``<style>`` block.
+"""
+from functools import lru_cache
+
+PALETTES = {
+    False: {
+        "--bg": "#f7fbfd",
+        "--card": "#ffffff",
+        "--accent": "#4EC0F0",
+        "--muted": "#1b5899",
+    },
+    True: {
+        "--bg": "#000000",
+        "--card": "#111111",
+        "--accent": "#FFD166",
+        "--muted": "#FFFFFF",
+    },
+}
+
+MIN_FONT_SIZE = 12
+MAX_FONT_SIZE = 28
+DEFAULT_FONT_SIZE = 18
+FONT_SIZES = range(MIN_FONT_SIZE, MAX_FONT_SIZE + 1, 2)
+
+STYLESHEET = """
+<style>
+    html, body, [data-testid='stAppViewContainer'] {
+        background: var(--bg);
+        color: var(--muted);
+        font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial;
+        font-size: var(--font-size);
+    }
+    .main-title { font-size: calc(var(--font-size) * 1.8); font-weight:700; color:var(--accent); margin-bottom:6px; }
+    .subtitle { font-size: calc(var(--font-size) * 1.0); color:var(--accent); margin-bottom:10px; }
+    .card {
+        background: var(--card);
+        padding: 18px;
+        border-radius: var(--radius);
+        box-shadow: 0 3px 10px rgba(0,0,0,0.06);
+        margin-bottom: 14px;
+        color: var(--muted);
+    }
+    .course-title { font-size: calc(var(--font-size) * 1.1); font-weight:700; color:var(--accent); }
+    .muted { color:var(--muted); font-size: calc(var(--font-size) * 0.95); }
+    .stButton>button {
+        background-color: var(--accent);
+        color: #000000;
+        border-radius: 10px;
+        padding: 8px 12px;
+        font-size: calc(var(--font-size) * 0.95);
+        border: none;
+    }
+    .stButton>button:hover { filter: brightness(0.95); }
+    .big-input input, .big-input textarea {
+        font-size: calc(var(--font-size) * 1.05) !important;
+        color: var(--muted) !important;
+    }
+    .chat-bubble {
+        padding: 12px 16px;
+        border-radius: 12px;
+        margin-bottom: 8px;
+        display: block;
+        max-width: 90%;
+    }
+    .user {
+        background: var(--accent);
+        color: #000000;
+        text-align: right;
+        margin-left: auto;
+    }
+    .bot {
+        background: #E0F7FA;
+        color: #000;
+        text-align: left;
+    }
+    div[role="radiogroup"] label p,
+    div[data-testid="stMarkdownContainer"] p,
+    .stRadio > label,
+    .stTextInput > label,
+    .stSelectbox > label,
+    .stNumberInput > label {
+        color: var(--muted) !important;
+        font-weight: 600;
+        font-size: calc(var(--font-size) * 1.0);
+    }
+    .stRadio > div {
+        background-color: var(--card);
+        border-radius: 10px;
+        padding: 6px 10px;
+        box-shadow: 0 1px 3px rgba(0,0,0,0.05);
+    }
+    .listen-btn {
+        display:inline-block;
+        margin-left:8px;
+        padding:6px 10px;
+        border-radius:8px;
+        background: var(--accent);
+        color: #000;
+        font-weight:600;
+        text-decoration:none;
+        cursor:pointer;
+    }
+    .footer { font-size: calc(var(--font-size) * 0.85); color: var(--muted); text-align:center; margin-top:20px; }
+</style>
+"""
+
+
+@lru_cache(maxsize=None)
+def theme_vars(high_contrast, font_size):
+    """The only per-user part of the theme: a ``:root`` variable block."""
+    palette = PALETTES[bool(high_contrast)]
+    lines = "".join(f"{name}: {value}; " for name, value in palette.items())
+    return f"<style>:root {{ {lines}--radius: 12px; --font-size: {int(font_size)}px; }}</style>"
+
+
+# Todas as variantes (2 paletas x 9 tamanhos) já prontas na importação
+for _contrast in PALETTES:
+    for _size in FONT_SIZES:
+        theme_vars(_contrast, _size)
@@ -0,0 +1 @@
+"""One module per page; each exposes ``render(speech)`` and is imported only when its page is opened."""
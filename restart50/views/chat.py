@@ -0,0 +1,70 @@
+"""Chatbot: intent/search assistant with the shared response cache."""
+import html as html_lib
+import os
+from datetime import datetime
+
+import streamlit as st
+
+from restart50 import chatlog, resources
+from restart50.speech import listen_link
+
+OLDER_PAGE = 30
+MAX_OLDER_PAGES = 10  # limita quanto histórico antigo uma sessão mantém aberto
+
+
+def _bubble(msg):
+    """Bubble + listen link of a stored message: ``(html, speech id, speech text)``."""
+    who = "Você" if msg.role == "user" else "Assistente"
+    sid, text, link = listen_link(msg.text)
+    return f"<div class='chat-bubble {msg.role}'><b>{who}:</b> {html_lib.escape(msg.text)}</div>{link}", sid, text
+
+
+def _owner():
+    # Com login a conversa segue o usuário entre sessões; sem login fica só na memória desta sessão
+    if st.session_state.user:
+        return st.session_state.user["id"]
+    if "chat_guest" not in st.session_state:
+        st.session_state.chat_guest = chatlog.guest()
+    return st.session_state.chat_guest
+
+
+def render(speech):
+    catalog = resources.catalog()
+    log = resources.chat_log()
+    owner = _owner()
+    st.header("🤖 Assistente ReStart")
+    st.write("Pergunte algo sobre cursos, avaliações ou como usar a plataforma")
+    if not st.session_state.user:
+        st.caption("Faça login para guardar suas conversas e continuar de onde parou.")
+    user_msg = st.text_input("Digite sua dúvida aqui", key="chat_input_big")
+    if st.button("Enviar pergunta"):
+        if user_msg and user_msg.strip():
+            asked = datetime.utcnow().isoformat()
+            bot = resources.chatbot()
+            bot.use(resources.intent_engine(os.path.getmtime(resources.INTENTS_FILE)), resources.course_index(catalog.content_version()))
+            reply = bot.reply(user_msg)
+            added = log.append(owner, [("user", user_msg, asked), ("bot", reply, datetime.utcnow().isoformat())])
+            if st.session_state.auto_read_chat:
+                speech.speak_now(reply, nonce=added[-1].ts)
+
+    messages = log.messages(owner)
+    pages = st.session_state.get("chat_older_pages", 0)
+    if messages and pages:
+        older = log.older(owner, before=messages[0].id, limit=pages * OLDER_PAGE + 1)
+        has_more = len(older) > pages * OLDER_PAGE
+        messages = older[-pages * OLDER_PAGE:] + messages
+    else:
+        has_more = log.has_older(owner)
+    if has_more and pages < MAX_OLDER_PAGES and st.button("⬆️ Carregar mensagens anteriores"):
+        st.session_state.chat_older_pages = pages + 1
+        resources.safe_rerun()
+
+    for msg in messages:
+        html, sid, text = log.html(msg, _bubble)
+        st.markdown(html, unsafe_allow_html=True)
+        speech.add(sid, text)
+
+    if st.button("Limpar conversa"):
+        log.clear(owner, datetime.utcnow().isoformat())
+        st.session_state.chat_older_pages = 0
+        st.success("Conversa limpa.")
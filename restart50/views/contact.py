@@ -0,0 +1,57 @@
+"""Contato com Instrutor: message form and the learner's recent messages."""
+import uuid
+from datetime import datetime
+
+import streamlit as st
+
+from restart50 import resources
+
+
+def render(speech):
+    store = resources.store()
+    catalog = resources.catalog()
+    st.header("📬 Contato com Instrutor")
+    st.write("Envie sua dúvida ao instrutor.")
+    with st.form("contact_form"):
+        name = st.text_input("Seu nome", value=(st.session_state.user.get("name") if st.session_state.user else ""))
+        email = st.text_input("Seu e-mail", value=(st.session_state.user.get("email") if st.session_state.user else ""))
+        course_choice = st.selectbox("Sobre qual curso?", options=["Geral"] + [c["title"] for c in catalog.courses])
+        message = st.text_area("Sua dúvida / mensagem", height=140)
+        send = st.form_submit_button("Enviar mensagem")
+        if send:
+            if not message.strip():
+                st.warning("Escreva sua dúvida antes de enviar.")
+            else:
+                msg = {
+                    "id": str(uuid.uuid4()),
+                    "name": name or "Anônimo",
+                    "email": email or "",
+                    "course": course_choice,
+                    "message": message,
+                    "ts": datetime.utcnow().isoformat(),
+                    "status": "novo"
+                }
+                # A entrega acontece em segundo plano; aqui só gravamos mensagem + outbox
+                notifier = resources.notifier()
+                store.put_contact(msg, outbox=notifier.outbox_rows(msg) if notifier else ())
+                if notifier:
+                    notifier.wake()
+                    conf = "Mensagem enviada! O instrutor será avisado em instantes."
+                else:
+                    conf = "Mensagem enviada! O instrutor verá sua dúvida no painel."
+                st.success(conf)
+                speech.listen_button(conf)
+
+    if st.session_state.user:
+        st.markdown("### Suas mensagens recentes")
+        user_email = st.session_state.user.get("email")
+        user_messages = store.recent_contacts(user_email, limit=5)
+        if user_messages:
+            for m in user_messages:
+                st.markdown('<div class="card">', unsafe_allow_html=True)
+                st.write(f"**Curso:** {m.get('course')} — {m.get('ts').split('T')[0]}")
+                st.write(m.get("message"))
+                st.write(f"Status: {m.get('status')}")
+                st.markdown('</div>', unsafe_allow_html=True)
+        else:
+            st.info("Nenhuma mensagem enviada por você.")
@@ -0,0 +1,57 @@
+"""Cursos: filtered, paginated catalog with enrollment."""
+import streamlit as st
+
+from restart50 import resources
+
+
+def render(speech):
+    store = resources.store()
+    catalog = resources.catalog()
+    st.header("🎓 Cursos — Profissões do Futuro")
+    filter_col1, filter_col2 = st.columns([1,1])
+    category = filter_col1.selectbox("Categoria", ["Todas"] + sorted(catalog.by_category), key="courses_category")
+    level = filter_col2.selectbox("Nível", ["Todos"] + sorted(catalog.by_level), key="courses_level")
+    matches = catalog.filter(None if category == "Todas" else category, None if level == "Todos" else level)
+
+    # Paginação no servidor: só os cartões da página atual são montados
+    filters = (category, level)
+    if st.session_state.get("courses_filters") != filters:
+        st.session_state.courses_filters = filters
+        st.session_state.courses_page = 0
+    total_pages = max(1, -(-len(matches) // resources.COURSES_PER_PAGE))
+    page_no = min(st.session_state.get("courses_page", 0), total_pages - 1)
+    visible = matches[page_no * resources.COURSES_PER_PAGE:(page_no + 1) * resources.COURSES_PER_PAGE]
+    if not matches:
+        st.info("Nenhum curso encontrado com esses filtros.")
+
+    cols = st.columns(2)
+    for i, course in enumerate(visible):
+        with cols[i % 2]:
+            st.markdown('<div class="card">', unsafe_allow_html=True)
+            # Miniatura local quando já estiver pronta; enquanto baixa (ou se falhar), usa a imagem original
+            st.image(resources.image_cache().thumbnail(course["image"]) or course["image"])
+            st.markdown(catalog.card_html(course["id"]), unsafe_allow_html=True)
+            speech.listen_button(course["description"])
+            enroll_col1, enroll_col2 = st.columns([1,1])
+            if st.session_state.user:
+                if enroll_col1.button("Iniciar curso", key=f"start_{course['id']}"):
+                    uid = st.session_state.user["id"]
+                    store.enroll(uid, course["id"], default=st.session_state.user)
+                    st.success(f"Curso '{course['title']}' iniciado. Vá para 'Avaliações' para fazer o quiz quando finalizar o estudo.")
+            else:
+                enroll_col1.info("Faça login para iniciar")
+
+            if enroll_col2.button("Fazer avaliação (quiz)", key=f"quiz_{course['id']}"):
+                st.session_state["quiz_course"] = course["id"]
+                resources.safe_rerun()
+            st.markdown('</div>', unsafe_allow_html=True)
+
+    if total_pages > 1:
+        nav_prev, nav_info, nav_next = st.columns([1,2,1])
+        if nav_prev.button("← Anterior", disabled=page_no == 0):
+            st.session_state.courses_page = page_no - 1
+            resources.safe_rerun()
+        nav_info.markdown(f"<div class='muted' style='text-align:center'>Página {page_no + 1} de {total_pages}</div>", unsafe_allow_html=True)
+        if nav_next.button("Próxima →", disabled=page_no >= total_pages - 1):
+            st.session_state.courses_page = page_no + 1
+            resources.safe_rerun()
@@ -0,0 +1,13 @@
+"""Início: welcome card."""
+import streamlit as st
+
+
+def render(speech):
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.subheader("Bem-vindo(a) à ReStart 50+")
+    intro_text = ("Plataforma pensada para facilitar o aprendizado, com conteúdos práticos, curtos e claros. "
+                  "Destaques: cursos sobre IA, Dados, IoT, Marketing Digital e Empreendedorismo; avaliações curtas; "
+                  "contato com instrutores.")
+    st.write(intro_text)
+    speech.listen_button(intro_text)
+    st.markdown('</div>', unsafe_allow_html=True)
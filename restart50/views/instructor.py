@@ -0,0 +1,100 @@
+"""Painel do Instrutor: cohort analytics and the contact inbox."""
+from datetime import timedelta
+
+import streamlit as st
+
+from restart50 import resources
+from restart50.storage import CONTACT_STATUSES
+
+
+def render(speech):
+    store = resources.store()
+    catalog = resources.catalog()
+    st.header("📊 Painel do Instrutor")
+    tab_stats, tab_inbox = st.tabs(["Análises", "Caixa de entrada"])
+
+    with tab_stats:
+        analytics = resources.analytics()
+        analytics.refresh()
+        rows = []
+        for c in catalog.courses:
+            report = analytics.course_report(c["id"])
+            funnel = analytics.funnel(c["id"])
+            rows.append({
+                "Curso": c["title"],
+                "Matriculados": funnel["enrolled"],
+                "Fizeram o quiz": funnel["attempted"],
+                "Aprovados": funnel["passed"],
+                "Aprovação (%)": round(report["pass_rate"] * 100) if report["pass_rate"] is not None else None,
+                "Tentativas": report["attempts"],
+                "Nota média": report["mean_score"],
+            })
+        st.dataframe(rows, hide_index=True)
+
+        course = catalog.get(st.selectbox("Detalhar curso", options=[c["id"] for c in catalog.courses],
+                                         format_func=lambda cid: catalog.get(cid)["title"]))
+        report = analytics.course_report(course["id"])
+        st.markdown("#### Distribuição de notas")
+        # Rótulos com três dígitos para o gráfico manter a ordem das faixas
+        labels = [f"{b * 10:03d}-{b * 10 + 9:03d}" for b in range(10)] + ["100"]
+        st.bar_chart({"Tentativas": dict(zip(labels, report["histogram"]))})
+        st.markdown("#### Dificuldade e discriminação por questão")
+        st.caption("Acertos: proporção de respostas certas. Discriminação: correlação entre acertar a questão e ir bem no resto do quiz (abaixo de 0,2 merece revisão).")
+        quiz = catalog.quiz(course["id"])
+        difficulty = analytics.question_difficulty(course["id"])
+        discrimination = analytics.question_discrimination(course["id"])
+        st.dataframe([
+            {"Questão": f"{i + 1}. {q['q']}",
+             "Acertos (%)": round(difficulty[i] * 100) if i < len(difficulty) and difficulty[i] is not None else None,
+             "Discriminação": discrimination[i] if i < len(discrimination) else None}
+            for i, q in enumerate(quiz)
+        ], hide_index=True)
+
+    with tab_inbox:
+        if st.session_state.get("inbox_flash"):
+            st.success(st.session_state.pop("inbox_flash"))
+        f_course, f_status, f_dates = st.columns([2,1,2])
+        inbox_course = f_course.selectbox("Curso", ["Todos", "Geral"] + [c["title"] for c in catalog.courses], key="inbox_course")
+        inbox_status = f_status.selectbox("Status", ["Todos"] + CONTACT_STATUSES, key="inbox_status")
+        inbox_dates = f_dates.date_input("Período", value=(), key="inbox_dates")
+        since = inbox_dates[0].isoformat() if len(inbox_dates) > 0 else None
+        until = (inbox_dates[1] + timedelta(days=1)).isoformat() if len(inbox_dates) > 1 else None
+
+        # Paginação por cursor (ts, id): cada página é uma busca no índice, sem ordenar tudo
+        inbox_filters = (inbox_course, inbox_status, since, until)
+        if st.session_state.get("inbox_filters") != inbox_filters:
+            st.session_state.inbox_filters = inbox_filters
+            st.session_state.inbox_cursors = [None]
+        cursors = st.session_state.inbox_cursors
+        messages, next_cursor = store.find_contacts(
+            course=None if inbox_course == "Todos" else inbox_course,
+            status=None if inbox_status == "Todos" else inbox_status,
+            since=since, until=until, after=cursors[-1], limit=resources.INBOX_PAGE_SIZE,
+        )
+
+        if not messages:
+            st.info("Nenhuma mensagem com esses filtros.")
+        selected_ids = []
+        for m in messages:
+            st.markdown('<div class="card">', unsafe_allow_html=True)
+            if st.checkbox(f"{m.get('name')} <{m.get('email')}> — {m.get('course')} — {(m.get('ts') or '').replace('T', ' ')[:16]} — {m.get('status')}",
+                           key=f"inbox_sel_{m['id']}"):
+                selected_ids.append(m["id"])
+            st.write(m.get("message"))
+            st.markdown('</div>', unsafe_allow_html=True)
+
+        act_answered, act_closed, act_prev, act_next = st.columns(4)
+        if act_answered.button("Marcar como respondido", disabled=not selected_ids):
+            changed = store.set_contact_status(selected_ids, "respondido")
+            st.session_state.inbox_flash = f"{changed} mensagem(ns) marcada(s) como respondida(s)."
+            resources.safe_rerun()
+        if act_closed.button("Fechar", disabled=not selected_ids):
+            changed = store.set_contact_status(selected_ids, "fechado")
+            st.session_state.inbox_flash = f"{changed} mensagem(ns) fechada(s)."
+            resources.safe_rerun()
+        if act_prev.button("← Anterior", key="inbox_prev", disabled=len(cursors) == 1):
+            cursors.pop()
+            resources.safe_rerun()
+        if act_next.button("Próxima →", key="inbox_next", disabled=next_cursor is None):
+            cursors.append(next_cursor)
+            resources.safe_rerun()
@@ -0,0 +1,62 @@
+"""Meu Progresso: per-user summary and attempt history."""
+import streamlit as st
+
+from restart50 import resources
+from restart50.progress import average_score, catalog_stats
+
+
+def render(speech):
+    store = resources.store()
+    catalog = resources.catalog()
+    st.header("📈 Meu Progresso e Notas")
+    if not st.session_state.user:
+        st.info("Faça login para ver seu progresso.")
+    else:
+        uid = st.session_state.user["id"]
+        user = store.users.get(uid, st.session_state.user)
+        progress = user.get("progress", {})
+        # Resumo mantido a cada tentativa registrada, descontando cursos fora do catálogo
+        stats = catalog_stats(user, catalog.by_id)
+        total_courses = len(catalog.courses)
+        completed_count = stats["completed"]
+        percent_completion = int((completed_count / total_courses) * 100) if total_courses else 0
+        avg_score = average_score(stats)
+
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        summary_text = f"Olá, {user.get('name')} — você concluiu {completed_count} de {total_courses} cursos. Progresso: {percent_completion}%."
+        st.subheader(summary_text)
+        speech.listen_button(summary_text)
+        st.progress(percent_completion)
+        if avg_score is not None:
+            st.write(f"• Nota média: **{avg_score}%**")
+        else:
+            st.write("• Nota média: — (nenhuma avaliação concluída ainda)")
+
+        st.markdown("### Detalhamento por curso")
+        for c in catalog.courses:
+            st.markdown('<div class="card">', unsafe_allow_html=True)
+            st.markdown(f"**{c['title']}** — {c['level']} • {c['hours']}h")
+            p = progress.get(c["id"], {})
+            status = "✅ Concluído" if p.get("completed") else "⏳ Pendente"
+            score_text = f"{p.get('score')}%" if p.get("score") is not None else "—"
+            st.write(f"Status: **{status}** | Nota: **{score_text}**")
+            attempts = p.get("attempts", [])
+            if attempts:
+                st.write("Tentativas:")
+                for a in attempts[-3:][::-1]:
+                    ts = a.get("ts", "")
+                    scr = a.get("score", "")
+                    st.write(f"- {ts.split('T')[0]} — {scr}%")
+                rollup = p.get("rollup")
+                if rollup:
+                    st.write(f"Mais {rollup['count']} tentativas anteriores — melhor nota {rollup['best']}%, média {rollup['mean']}%.")
+                if len(attempts) > 3 or rollup:
+                    with st.expander("Ver histórico completo"):
+                        # Lido do arquivo de tentativas só quando o aluno pede
+                        if st.button("Carregar histórico", key=f"history_{c['id']}"):
+                            for a in store.attempt_history(uid, c["id"])[::-1]:
+                                st.write(f"- {(a['ts'] or '').split('T')[0]} — {a['score']}%")
+            else:
+                st.write("Nenhuma tentativa registrada.")
+            st.markdown('</div>', unsafe_allow_html=True)
+        st.markdown('</div>', unsafe_allow_html=True)
@@ -0,0 +1,48 @@
+"""Avaliações: course quiz form; attempts go through the write-behind store."""
+import streamlit as st
+
+from restart50 import resources
+
+
+def render(speech):
+    store = resources.store()
+    catalog = resources.catalog()
+    st.header("📝 Avaliações por Curso")
+    selected = st.selectbox("Escolha um curso para avaliar", options=[(c["id"], c["title"]) for c in catalog.courses], format_func=lambda t: t[1])
+    course = catalog.get(selected[0])
+    if not course:
+        st.info("Selecione um curso.")
+    else:
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.markdown(f"### {course['title']}")
+        st.write(course["description"])
+        speech.listen_button(course["description"])
+        st.write("Responda ao pequeno questionário (rápido). As notas serão salvas no seu perfil e exibidas no Dashboard.")
+
+        quiz = catalog.quiz(course["id"])
+        if not st.session_state.user:
+            st.info("Faça login para responder a avaliação e salvar sua nota.")
+        elif not quiz:
+            # Sem gabarito não há o que corrigir (Grader.key levantaria KeyError)
+            st.info("Este curso ainda não tem avaliação.")
+        else:
+            answers = []
+            with st.form(f"quiz_form_{course['id']}"):
+                for idx, q in enumerate(quiz):
+                    question_text = f"**{idx+1}. {q['q']}**"
+                    st.markdown(question_text)
+                    speech.listen_button(q['q'])
+                    choice_idx = st.radio("", options=list(range(len(q["choices"]))),
+                                          format_func=lambda x, q=q: q["choices"][x],
+                                          key=f"q_{course['id']}_{idx}")
+                    answers.append(choice_idx)
+                submitted = st.form_submit_button("Enviar respostas")
+                if submitted:
+                    # Correção no servidor, contra o gabarito pré-compilado do curso
+                    attempt = resources.grader().attempt(course["id"], answers)
+                    uid = st.session_state.user["id"]
+                    store.record_attempt(uid, course["id"], attempt, default=st.session_state.user)
+                    msg = f"Avaliação enviada! Você obteve {attempt['raw']}/{len(quiz)} ({attempt['score']}%). A nota foi salva no seu perfil."
+                    st.success(msg)
+                    speech.listen_button(msg)
+        st.markdown('</div>', unsafe_allow_html=True)
@@ -0,0 +1,155 @@
+"""Write-behind queue: persists events on a background thread in batches.
+
+Handlers call ``submit(event)`` and return immediately. The writer thread
+groups whatever arrives within ``window`` seconds (or up to ``max_batch``
+events) and hands the batch to ``handler`` as one durable write. The queue
+is bounded: when it is full ``submit`` blocks, and the time spent waiting is
+reported in ``metrics()`` as backpressure.
+
+A batch that still fails after ``retries`` is retried one event at a time,
+so a single bad event does not take the rest with it; whatever still fails
+is passed to ``on_drop(events)`` and counted as ``failed``.
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class WriteBehind:
+    def __init__(self, handler, window=0.05, max_batch=500, maxsize=10000, retries=3, on_drop=None):
+        self.handler = handler
+        self.on_drop = on_drop
+        self.window = window
+        self.max_batch = max_batch
+        self.retries = retries
+        self._queue = queue.Queue(maxsize)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "failed": 0,
+            "max_depth": 0,
+            "blocked": 0,
+            "blocked_seconds": 0.0,
+            "last_batch_size": 0,
+            "last_write_seconds": 0.0,
+        }
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="restart50-writebehind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, event):
+        """Queue an event; blocks only while the queue is full."""
+        if self._closed:
+            raise RuntimeError("write-behind queue is closed")
+        try:
+            self._queue.put_nowait(event)
+            waited = 0.0
+        except queue.Full:
+            start = time.perf_counter()
+            self._queue.put(event)
+            waited = time.perf_counter() - start
+        with self._stats_lock:
+            self._stats["enqueued"] += 1
+            self._stats["max_depth"] = max(self._stats["max_depth"], self._queue.qsize())
+            if waited:
+                self._stats["blocked"] += 1
+                self._stats["blocked_seconds"] += waited
+
+    def flush(self):
+        """Block until every queued event has been written."""
+        self._queue.join()
+
+    def close(self):
+        """Flush pending events and stop the writer thread (idempotent)."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def metrics(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["depth"] = self._queue.qsize()
+        stats["capacity"] = self._queue.maxsize
+        return stats
+
+    # ---------- Thread de escrita ----------
+    def _collect(self, first):
+        batch = [first]
+        stop = False
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                stop = True
+                break
+            batch.append(item)
+        return batch, stop
+
+    def _write(self, batch):
+        start = time.perf_counter()
+        for attempt in range(self.retries + 1):
+            try:
+                self.handler(batch)
+                break
+            except Exception:
+                if attempt == self.retries:
+                    log.exception("write-behind: batch of %d events failed", len(batch))
+                    self._write_each(batch)
+                    return
+                time.sleep(0.05 * 2 ** attempt)
+        with self._stats_lock:
+            self._stats["written"] += len(batch)
+            self._stats["batches"] += 1
+            self._stats["last_batch_size"] = len(batch)
+            self._stats["last_write_seconds"] = time.perf_counter() - start
+
+    def _write_each(self, batch):
+        # Um evento por vez: só os que falham sozinhos são descartados
+        dropped = list(batch) if len(batch) == 1 else []
+        for event in batch if len(batch) > 1 else ():
+            try:
+                self.handler([event])
+            except Exception:
+                dropped.append(event)
+        if dropped:
+            log.error("write-behind: dropping %d of %d events", len(dropped), len(batch))
+        with self._stats_lock:
+            self._stats["written"] += len(batch) - len(dropped)
+            self._stats["failed"] += len(dropped)
+        if dropped and self.on_drop is not None:
+            try:
+                self.on_drop(dropped)
+            except Exception:
+                log.exception("write-behind: on_drop failed")
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                self._queue.task_done()
+                return
+            batch, stop = self._collect(first)
+            try:
+                self._write(batch)
+            finally:
+                for _ in range(len(batch) + stop):
+                    self._queue.task_done()
+            if stop:
+                return
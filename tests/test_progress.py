@@ -0,0 +1,45 @@
+"""Inline attempts and their rollup at the ``keep`` boundaries."""
+import pytest
+
+from restart50 import progress
+
+
+def attempt(ts, score):
+    return {"ts": ts, "score": score, "raw": 0, "correct": ""}
+
+
+def recorded(keep, scores):
+    user = {}
+    for i, score in enumerate(scores):
+        progress.record_attempt(user, "c1", attempt(f"2024-01-0{i + 1}", score), keep=keep)
+    return user["progress"]["c1"]
+
+
+def test_keep_zero_rolls_up_everything():
+    entry = recorded(0, [40, 80])
+    assert entry["attempts"] == []
+    assert entry["rollup"]["count"] == 2
+    assert entry["rollup"]["best"] == 80
+    assert entry["rollup"]["mean"] == 60.0
+    assert entry["score"] == 80
+
+
+def test_keep_one_keeps_latest_inline():
+    entry = recorded(1, [40, 80, 70])
+    assert [a["score"] for a in entry["attempts"]] == [70]
+    assert entry["rollup"]["count"] == 2
+    assert entry["rollup"]["first_ts"] == "2024-01-01"
+    assert entry["rollup"]["last_ts"] == "2024-01-02"
+
+
+def test_keep_one_single_attempt_has_no_rollup():
+    entry = recorded(1, [50])
+    assert len(entry["attempts"]) == 1
+    assert "rollup" not in entry
+
+
+def test_store_rejects_negative_keep(tmp_path):
+    from restart50.storage import Store
+
+    with pytest.raises(ValueError):
+        Store(str(tmp_path / "db.sqlite"), attempts_inline=-1)
@@ -0,0 +1,45 @@
+"""Smoke test of the quiz form: log in, answer a quiz, get it graded."""
+import json
+import os
+import shutil
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+APP = os.path.join(ROOT, "ReStart50-Web-MVP.py")
+DATA = os.path.join(ROOT, "data")
+
+
+def find(elements, label):
+    return next(e for e in elements if e.label == label)
+
+
+def test_quiz_submit_is_graded(tmp_path, monkeypatch):
+    for name in ("courses.json", "intents.json"):
+        shutil.copy(os.path.join(DATA, name), tmp_path / name)
+    shutil.copytree(os.path.join(DATA, "quizzes"), tmp_path / "quizzes")
+    monkeypatch.setenv("RESTART50_DATA_DIR", str(tmp_path))
+    monkeypatch.chdir(ROOT)
+
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.run()
+    find(at.text_input, "Nome").input("Aluna Teste")
+    find(at.text_input, "E-mail").input("aluna.teste@exemplo.com")
+    find(at.button, "Entrar / Criar conta").click()
+    at.run()
+
+    find(at.sidebar.radio, "📚 Menu").set_value("Avaliações")
+    at.run()
+    course_id = find(at.selectbox, "Escolha um curso para avaliar").value[0]
+    with open(tmp_path / "quizzes" / f"{course_id}.json", encoding="utf-8") as f:
+        quiz = json.load(f)
+    for idx, q in enumerate(quiz):
+        at.radio(key=f"q_{course_id}_{idx}").set_value(q["answer"])
+    find(at.button, "Enviar respostas").click()
+    at.run()
+
+    assert not at.exception
+    assert any(f"{len(quiz)}/{len(quiz)} (100%)" in s.value for s in at.success)